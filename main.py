@@ -7,12 +7,23 @@ with uncertainty quantification at 0.5° grid resolution.
 
 from fastapi import FastAPI, HTTPException, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from typing import List, Optional, Dict, Any
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response, StreamingResponse
+from typing import List, Optional, Dict, Any, Tuple
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import io
 import logging
+import os
+import sys
+import time
+import orjson
+import pyarrow as pa
 
 from models.schemas import (
     ForecastResponse,
@@ -21,7 +32,7 @@ from models.schemas import (
     ErrorResponse,
     MetricSelection
 )
-from services.data_service import DataService
+from services.data_service import DataPaths, DataService
 from services.forecast_service import ForecastService
 from utils.exceptions import DataNotFoundError, ValidationError
 
@@ -29,24 +40,75 @@ from utils.exceptions import DataNotFoundError, ValidationError
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _warm_up_forecasts() -> None:
+    """Run one representative month query so the first client request is not cold."""
+    months = data_service.get_available_months()
+    if months:
+        _cached_month_bytes(months[0], None, MetricSelection().cache_key())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load data and warm caches before serving requests."""
+    # Service calls are pandas-bound; run them on a pool sized for the host
+    # so concurrent requests overlap instead of blocking the event loop.
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=2 * (os.cpu_count() or 1))
+    loop.set_default_executor(executor)
+    try:
+        try:
+            await asyncio.to_thread(data_service.load_data)
+            _info_cache.clear()
+            _cached_month_bytes.cache_clear()
+            _info_cache["info"] = await asyncio.to_thread(_serialize_basic_info)
+            _info_cache["countries"] = await asyncio.to_thread(_serialize_countries)
+            logger.info("Data loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load data: {e}")
+            raise
+        
+        try:
+            await asyncio.to_thread(_warm_up_forecasts)
+            logger.info("Forecast warm-up query completed")
+        except Exception as e:
+            logger.warning(f"Forecast warm-up query failed: {e}")
+        
+        yield
+    finally:
+        # Also reached when startup fails, so the pool never outlives the app
+        executor.shutdown(wait=False)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="VIEWS Conflict Forecasting API",
     description="Global conflict forecasting system with uncertainty quantification",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware for dashboard
+# CORS for cross-origin dashboard embeds; the bundled dashboard is served
+# from this app and is same-origin. DASHBOARD_ORIGIN is a comma-separated list.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("DASHBOARD_ORIGIN", "http://localhost:8000").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["GET", "OPTIONS"],
+    allow_headers=["content-type"],
 )
 
+# Compress large JSON/NDJSON forecast payloads; added last so it wraps CORS
+# and compresses the final response
+app.add_middleware(GZipMiddleware, minimum_size=2048, compresslevel=5)
+
 # Mount static files for dashboard
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -54,224 +116,109 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 data_service = DataService()
 forecast_service = ForecastService(data_service)
 
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize data on startup."""
-    try:
-        data_service.load_data()
-        logger.info("Data loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load data: {e}")
-        raise
-
-
-@app.get("/", response_class=HTMLResponse)
-async def dashboard():
-    """Serve the main dashboard."""
-    dashboard_path = Path("static/dashboard.html")
-    if dashboard_path.exists():
-        return HTMLResponse(content=dashboard_path.read_text(encoding='utf-8'))
-    else:
-        # If dashboard file doesn't exist, return a simple redirect to docs
-        return HTMLResponse(content="""
-        <html>
-            <head><title>VIEWS API</title></head>
-            <body>
-                <h1>VIEWS Conflict Forecasting API</h1>
-                <p>Dashboard file not found. Available endpoints:</p>
-                <ul>
-                    <li><a href="/docs">API Documentation (Swagger)</a></li>
-                    <li><a href="/redoc">API Documentation (ReDoc)</a></li>
-                    <li><a href="/api/info">API Information</a></li>
-                </ul>
-                <p>To set up the dashboard, create a file at <code>static/dashboard.html</code></p>
-            </body>
-        </html>
-        """)
-
-
-def get_simple_dashboard():
-    """Return a simple working dashboard."""
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>VIEWS Conflict Forecasting Dashboard</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
-            .container { max-width: 1200px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-            .header { text-align: center; margin-bottom: 30px; }
-            .controls { background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
-            .form-row { display: flex; gap: 20px; margin-bottom: 15px; flex-wrap: wrap; }
-            .form-col { flex: 1; min-width: 200px; }
-            label { display: block; margin-bottom: 5px; font-weight: bold; }
-            input, select, button { width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; }
-            button { background: #007bff; color: white; cursor: pointer; font-weight: bold; }
-            button:hover { background: #0056b3; }
-            .results { margin-top: 20px; }
-            .error { background: #f8d7da; color: #721c24; padding: 15px; border-radius: 4px; margin: 10px 0; }
-            .success { background: #d4edda; color: #155724; padding: 15px; border-radius: 4px; margin: 10px 0; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>VIEWS Conflict Forecasting Dashboard</h1>
-                <p>Global conflict predictions with uncertainty quantification</p>
-                <div id="apiStatus">API Status: <span id="statusText">Checking...</span></div>
-            </div>
-
-            <div class="controls">
-                <div class="form-row">
-                    <div class="form-col">
-                        <label for="queryType">Query Type:</label>
-                        <select id="queryType">
-                            <option value="info">API Information</option>
-                            <option value="countries">List Countries</option>
-                            <option value="month">Query by Month</option>
-                        </select>
-                    </div>
-                    <div class="form-col">
-                        <label for="monthId">Month ID:</label>
-                        <input type="number" id="monthId" value="548" placeholder="e.g., 548">
-                    </div>
-                    <div class="form-col" style="display: flex; align-items: end;">
-                        <button onclick="executeQuery()">Execute Query</button>
-                    </div>
-                </div>
-            </div>
-
-            <div class="results" id="resultsSection" style="display: none;">
-                <h3>Results</h3>
-                <div id="resultsContent"></div>
-            </div>
-        </div>
-
-        <script>
-            let apiBaseUrl = '/api';
-
-            // Check API status on load
-            checkAPIStatus();
-
-            async function checkAPIStatus() {
-                try {
-                    const response = await fetch(apiBaseUrl + '/info');
-                    const statusText = document.getElementById('statusText');
-                    if (response.ok) {
-                        statusText.textContent = 'Online';
-                        statusText.style.color = 'green';
-                    } else {
-                        statusText.textContent = 'Error';
-                        statusText.style.color = 'red';
-                    }
-                } catch (error) {
-                    document.getElementById('statusText').textContent = 'Offline';
-                    document.getElementById('statusText').style.color = 'red';
-                }
-            }
-
-            async function executeQuery() {
-                const queryType = document.getElementById('queryType').value;
-                const monthId = document.getElementById('monthId').value;
-                const resultsSection = document.getElementById('resultsSection');
-                const resultsContent = document.getElementById('resultsContent');
-                
-                resultsContent.innerHTML = '<p>Loading...</p>';
-                resultsSection.style.display = 'block';
-
-                try {
-                    let url = '';
-                    switch (queryType) {
-                        case 'info':
-                            url = apiBaseUrl + '/info';
-                            break;
-                        case 'countries':
-                            url = apiBaseUrl + '/countries';
-                            break;
-                        case 'month':
-                            url = apiBaseUrl + '/forecasts/month/' + monthId + '?include_map=true&include_thresholds=true';
-                            break;
-                    }
-
-                    const response = await fetch(url);
-                    if (!response.ok) throw new Error('HTTP ' + response.status);
-                    
-                    const data = await response.json();
-                    displayResults(data, queryType);
-                    
-                } catch (error) {
-                    resultsContent.innerHTML = '<div class="error">Error: ' + error.message + '</div>';
-                }
-            }
-
-            function displayResults(data, queryType) {
-                const resultsContent = document.getElementById('resultsContent');
-                
-                if (queryType === 'info') {
-                    resultsContent.innerHTML = `
-                        <div class="success">
-                            <h4>API Information</h4>
-                            <p><strong>Available Months:</strong> ${data.available_months.length} months</p>
-                            <p><strong>Total Grid Cells:</strong> ${data.total_grid_cells}</p>
-                            <p><strong>Countries:</strong> ${data.countries_available}</p>
-                            <p><strong>Date Range:</strong> ${data.date_range.start} to ${data.date_range.end}</p>
-                        </div>
-                    `;
-                } else if (queryType === 'countries') {
-                    const countriesList = data.map(c => 
-                        `<li>${c.country} (ID: ${c.country_id}, Grids: ${c.grid_cells_count || 'N/A'})</li>`
-                    ).join('');
-                    resultsContent.innerHTML = `
-                        <div class="success">
-                            <h4>Available Countries</h4>
-                            <ul>${countriesList}</ul>
-                        </div>
-                    `;
-                } else if (queryType === 'month') {
-                    const summary = `
-                        <div class="success">
-                            <h4>Forecast Summary</h4>
-                            <p><strong>Grid Cells:</strong> ${data.total_cells}</p>
-                            <p><strong>Months Covered:</strong> ${data.months_covered}</p>
-                            <p><strong>Sample Data:</strong></p>
-                            <ul>
-                                ${data.data.slice(0, 5).map(d => 
-                                    `<li>Grid ${d.grid_id}: Risk ${(d.main_mean || 0).toFixed(4)}, Country: ${d.country_name || 'Unknown'}</li>`
-                                ).join('')}
-                            </ul>
-                            ${data.data.length > 5 ? '<p>... and ' + (data.data.length - 5) + ' more</p>' : ''}
-                        </div>
-                    `;
-                    resultsContent.innerHTML = summary;
-                }
-            }
-        </script>
-    </body>
-    </html>
-    """
-
-
-@app.get("/dashboard/", response_class=HTMLResponse)
+# Serialized payloads of endpoints that only change when the data is reloaded
+_info_cache: Dict[str, bytes] = {}
+
+
+def _serialize_basic_info() -> bytes:
+    """Build the /api/info payload as JSON bytes."""
+    info = forecast_service.get_basic_info()
+    return orjson.dumps(BasicInfoResponse(**info).model_dump())
+
+
+def _serialize_countries() -> bytes:
+    """Build the /api/countries payload as JSON bytes."""
+    countries = forecast_service.get_countries()
+    return orjson.dumps(countries, option=orjson.OPT_SERIALIZE_NUMPY)
+
+# Serialized month responses; the data is immutable between reloads, so repeat
+# (month, country, metrics) queries are answered from memory. A full month is
+# about 6 MB and every worker process holds its own cache, so keep a handful.
+MONTH_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=MONTH_CACHE_SIZE)
+def _cached_month_bytes(month_id: int, country_id: Optional[int], metrics_key: tuple) -> bytes:
+    """Build the /api/forecasts/month payload as JSON bytes."""
+    include_map, include_hdi_50, include_hdi_90, include_hdi_99, include_thresholds, conflict_types = metrics_key
+    metrics = MetricSelection(
+        include_map=include_map,
+        include_hdi_50=include_hdi_50,
+        include_hdi_90=include_hdi_90,
+        include_hdi_99=include_hdi_99,
+        include_thresholds=include_thresholds,
+        conflict_types=list(conflict_types)
+    )
+    # Largest response in the API: serialize the service's dict records
+    # directly instead of round-tripping them through pydantic models
+    forecasts = forecast_service.get_forecast_records_by_month(
+        month_id=month_id,
+        country_id=country_id,
+        metrics=metrics
+    )
+    return orjson.dumps({
+        "data": forecasts,
+        "total_cells": len(forecasts),
+        "months_covered": 1,
+        "metadata": None
+    }, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _month_parquet_bytes(month_id: int, country_id: Optional[int], metrics: MetricSelection) -> bytes:
+    """Serialize a month's forecasts as a zstd-compressed Parquet file."""
+    df = forecast_service.get_forecasts_by_month_df(month_id, country_id, metrics)
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+    return buf.getvalue()
+
+
+def _month_arrow_bytes(month_id: int, country_id: Optional[int], metrics: MetricSelection) -> bytes:
+    """Serialize a month's forecasts as an Arrow IPC stream."""
+    df = forecast_service.get_forecasts_by_month_df(month_id, country_id, metrics)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+# Most grid IDs accepted by a single /api/forecasts/grid query
+MAX_GRID_IDS = 5000
+
+# Data files reported by /api/debug/files, and how long a stat snapshot is reused
+DEBUG_DATA_FILES = [
+    DataPaths.pgm_data,
+    DataPaths.country_data,
+    DataPaths.hdi_data,
+    DataPaths.timeseries_data,
+]
+DEBUG_FILES_TTL_SECONDS = 30.0
+_debug_files_cache: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+_debug_files_lock: Optional[asyncio.Lock] = None
+
+# Alternative dashboard route; the page itself is served by the "/" static mount
+@app.get("/dashboard/", include_in_schema=False)
 async def dashboard_alt():
-    """Alternative dashboard route."""
-    return await dashboard()
+    """Redirect to the main dashboard."""
+    return RedirectResponse(url="/")
 
 
-@app.get("/api/info", response_model=BasicInfoResponse)
+@app.get("/api/info", responses={200: {"model": BasicInfoResponse}})
 async def get_basic_info():
     """Get basic information about available data."""
+    if "info" in _info_cache:
+        return Response(content=_info_cache["info"], media_type="application/json")
     try:
-        info = forecast_service.get_basic_info()
-        return BasicInfoResponse(**info)
+        content = await asyncio.to_thread(_serialize_basic_info)
     except Exception as e:
         logger.error(f"Error getting basic info: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    # Don't pin an empty payload computed before the data finished loading
+    if data_service.is_loaded:
+        _info_cache["info"] = content
+    return Response(content=content, media_type="application/json")
 
 
-@app.get("/api/forecasts/country/{country_id}", response_model=ForecastResponse)
+@app.get("/api/forecasts/country/{country_id}", responses={200: {"model": ForecastResponse}})
 async def get_forecasts_by_country(
     country_id: int,
     month_start: Optional[int] = Query(None, description="Start month ID"),
@@ -280,17 +227,19 @@ async def get_forecasts_by_country(
 ):
     """Get forecasts for all grid cells in a country."""
     try:
-        forecasts = forecast_service.get_forecasts_by_country(
+        forecasts, months_covered = await asyncio.to_thread(
+            forecast_service.get_forecast_records_by_country,
             country_id=country_id,
             month_start=month_start,
             month_end=month_end,
             metrics=metrics
         )
-        return ForecastResponse(
-            data=forecasts,
-            total_cells=len(forecasts),
-            months_covered=len(set(f.month_id for f in forecasts)) if forecasts else 0
-        )
+        return ORJSONResponse({
+            "data": forecasts,
+            "total_cells": len(forecasts),
+            "months_covered": months_covered,
+            "metadata": None
+        })
     except DataNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
@@ -300,26 +249,30 @@ async def get_forecasts_by_country(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@app.get("/api/forecasts/grid", response_model=ForecastResponse)
+@app.get("/api/forecasts/grid", responses={200: {"model": ForecastResponse}})
 async def get_forecasts_by_grid(
-    grid_ids: List[int] = Query(..., description="Grid cell IDs"),
+    grid_ids: List[int] = Query(..., description="Grid cell IDs", min_length=1, max_length=MAX_GRID_IDS),
     month_start: Optional[int] = Query(None, description="Start month ID"),
     month_end: Optional[int] = Query(None, description="End month ID"),
     metrics: MetricSelection = Depends()
 ):
     """Get forecasts for specific grid cells."""
+    # Drop repeated IDs (keeping order) so the lookup works on a minimal set
+    grid_ids = list(dict.fromkeys(grid_ids))
     try:
-        forecasts = forecast_service.get_forecasts_by_grid(
+        forecasts, months_covered = await asyncio.to_thread(
+            forecast_service.get_forecast_records_by_grid,
             grid_ids=grid_ids,
             month_start=month_start,
             month_end=month_end,
             metrics=metrics
         )
-        return ForecastResponse(
-            data=forecasts,
-            total_cells=len(forecasts),
-            months_covered=len(set(f.month_id for f in forecasts)) if forecasts else 0
-        )
+        return ORJSONResponse({
+            "data": forecasts,
+            "total_cells": len(forecasts),
+            "months_covered": months_covered,
+            "metadata": None
+        })
     except DataNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
@@ -329,7 +282,85 @@ async def get_forecasts_by_grid(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@app.get("/api/forecasts/month/{month_id}", response_model=ForecastResponse)
+# Declared before /api/forecasts/month/{month_id} so the suffix isn't parsed as an ID
+@app.get("/api/forecasts/month/{month_id}.ndjson")
+async def stream_forecasts_by_month(
+    month_id: int,
+    country_id: Optional[int] = Query(None, description="Filter by country"),
+    metrics: MetricSelection = Depends()
+):
+    """Stream all forecasts for a specific month as newline-delimited JSON."""
+    batches = forecast_service.iter_forecast_records_by_month(
+        month_id=month_id,
+        country_id=country_id,
+        metrics=metrics
+    )
+    try:
+        # Pull the first batch before responding so lookup errors still get
+        # a proper status code instead of a truncated 200 stream
+        first_batch = await asyncio.to_thread(next, batches, [])
+    except DataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error streaming month forecasts: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    if not first_batch:
+        raise HTTPException(status_code=404, detail=f"No data found for month ID: {month_id}")
+    
+    async def generate():
+        batch = first_batch
+        while batch:
+            yield b"".join(
+                orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+                for record in batch
+            )
+            batch = await asyncio.to_thread(next, batches, [])
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.get("/api/forecasts/month/{month_id}.parquet")
+async def download_forecasts_by_month_parquet(
+    month_id: int,
+    country_id: Optional[int] = Query(None, description="Filter by country"),
+    metrics: MetricSelection = Depends()
+):
+    """Download all forecasts for a specific month as a Parquet file."""
+    try:
+        content = await asyncio.to_thread(_month_parquet_bytes, month_id, country_id, metrics)
+        return Response(content=content, media_type="application/vnd.apache.parquet")
+    except DataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting month forecasts to Parquet: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.get("/api/forecasts/month/{month_id}.arrow")
+async def download_forecasts_by_month_arrow(
+    month_id: int,
+    country_id: Optional[int] = Query(None, description="Filter by country"),
+    metrics: MetricSelection = Depends()
+):
+    """Download all forecasts for a specific month as an Arrow IPC stream."""
+    try:
+        content = await asyncio.to_thread(_month_arrow_bytes, month_id, country_id, metrics)
+        return Response(content=content, media_type="application/vnd.apache.arrow.stream")
+    except DataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting month forecasts to Arrow: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.get("/api/forecasts/month/{month_id}", responses={200: {"model": ForecastResponse}})
 async def get_forecasts_by_month(
     month_id: int,
     country_id: Optional[int] = Query(None, description="Filter by country"),
@@ -337,16 +368,10 @@ async def get_forecasts_by_month(
 ):
     """Get all forecasts for a specific month."""
     try:
-        forecasts = forecast_service.get_forecasts_by_month(
-            month_id=month_id,
-            country_id=country_id,
-            metrics=metrics
-        )
-        return ForecastResponse(
-            data=forecasts,
-            total_cells=len(forecasts),
-            months_covered=1
+        content = await asyncio.to_thread(
+            _cached_month_bytes, month_id, country_id, metrics.cache_key()
         )
+        return Response(content=content, media_type="application/json")
     except DataNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValidationError as e:
@@ -361,7 +386,7 @@ async def debug_coordinates():
     """Debug endpoint to check coordinate data."""
     try:
         # Get some sample coordinate data
-        coord_data = data_service.get_coordinates([])  # Get all coordinates
+        coord_data = await asyncio.to_thread(data_service.get_coordinates, [])  # Get all coordinates
         
         if coord_data.empty:
             return {"error": "No coordinate data found"}
@@ -378,28 +403,57 @@ async def debug_coordinates():
         return {"error": str(e)}
 
 
+def _stat_files(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Collect existence, size and readability of files (blocking syscalls)."""
+    files_status = {}
+    for file_path in file_paths:
+        path = Path(file_path)
+        exists = path.exists()
+        files_status[file_path] = {
+            "exists": exists,
+            "size": path.stat().st_size if exists else 0,
+            "readable": path.is_file() if exists else False
+        }
+    return files_status
+
+
+async def _get_files_status() -> Dict[str, Dict[str, Any]]:
+    """Return a recent stat snapshot of the data files, refreshing it off the loop."""
+    global _debug_files_cache, _debug_files_lock
+    if _debug_files_lock is None:
+        _debug_files_lock = asyncio.Lock()
+    
+    async with _debug_files_lock:
+        now = time.monotonic()
+        if _debug_files_cache is None or now - _debug_files_cache[0] > DEBUG_FILES_TTL_SECONDS:
+            files_status = await asyncio.to_thread(_stat_files, DEBUG_DATA_FILES)
+            _debug_files_cache = (now, files_status)
+        return _debug_files_cache[1]
+
+
+def _summarize_hdi_data() -> Dict[str, Any]:
+    """Summarize the loaded HDI data for the debug endpoint."""
+    # Access HDI data directly from data service
+    if data_service.hdi_data is None or data_service.hdi_data.empty:
+        return {"error": "No HDI data found"}
+    
+    hdi_data = data_service.hdi_data
+    sample_hdi = hdi_data.head(10).to_dict('records')
+    
+    return {
+        "total_hdi_records": len(hdi_data),
+        "columns": list(hdi_data.columns),
+        "sample_data": sample_hdi,
+        "unique_grids": len(hdi_data['priogrid_id'].unique()) if 'priogrid_id' in hdi_data.columns else 0,
+        "months_available": sorted(hdi_data['month_id'].unique().tolist()) if 'month_id' in hdi_data.columns else []
+    }
+
+
 @app.get("/api/debug/files")
 async def debug_files():
     """Debug endpoint to check what data files exist."""
     try:
-        from pathlib import Path
-        files_status = {}
-        
-        # Check each expected file
-        expected_files = [
-            "data/fatalities002_2025_07_t01_pgm.csv",
-            "data/fatalities002_2025_07_t01_cm.csv", 
-            "data/sample_preds_001_90.csv.gz",
-            "data/sample_preds_001.csv.gz"
-        ]
-        
-        for file_path in expected_files:
-            path = Path(file_path)
-            files_status[file_path] = {
-                "exists": path.exists(),
-                "size": path.stat().st_size if path.exists() else 0,
-                "readable": path.is_file() if path.exists() else False
-            }
+        files_status = await _get_files_status()
         
         # Also check the data service state
         return {
@@ -408,43 +462,25 @@ async def debug_files():
                 "is_loaded": data_service.is_loaded,
                 "pgm_data_loaded": data_service.pgm_data is not None,
                 "country_data_loaded": data_service.country_data is not None,
-                "hdi_data_loaded": data_service.hdi_data is not None,
+                "hdi_data_loaded": data_service.loaded_hdi_data is not None,
                 "timeseries_data_loaded": data_service.timeseries_data is not None,
             }
         }
     except Exception as e:
         return {"error": str(e)}
-async def debug_hdi():
-    """Debug endpoint to check HDI data."""
-    try:
-        # Get some sample HDI data
-        hdi_data = data_service.get_hdi_data([])  # Get all HDI data
-        
-        if hdi_data.empty:
-            return {"error": "No HDI data found"}
-        
-        sample_hdi = hdi_data.head(10).to_dict('records')
-        
-        return {
-            "total_hdi_records": len(hdi_data),
-            "columns": list(hdi_data.columns),
-            "sample_data": sample_hdi,
-            "unique_grids": len(hdi_data['priogrid_id'].unique()) if 'priogrid_id' in hdi_data.columns else 0,
-            "months_available": sorted(hdi_data['month_id'].unique().tolist()) if 'month_id' in hdi_data.columns else []
-        }
-    except Exception as e:
-        return {"error": str(e)}
 
 
 @app.get("/api/debug/status")
 async def debug_status():
     """Simple debug endpoint to check data service status."""
     try:
+        # Report HDI state as is; reading it here would load the file on the event loop
+        hdi_data = data_service.loaded_hdi_data
         return {
             "data_service_loaded": data_service.is_loaded,
-            "hdi_data_exists": data_service.hdi_data is not None,
-            "hdi_data_length": len(data_service.hdi_data) if data_service.hdi_data is not None else 0,
-            "hdi_data_columns": list(data_service.hdi_data.columns) if data_service.hdi_data is not None else []
+            "hdi_data_exists": hdi_data is not None,
+            "hdi_data_length": len(hdi_data) if hdi_data is not None else 0,
+            "hdi_data_columns": list(hdi_data.columns) if hdi_data is not None else []
         }
     except Exception as e:
         return {"error": str(e)}
@@ -454,35 +490,39 @@ async def debug_status():
 async def debug_hdi():
     """Debug endpoint to check HDI data."""
     try:
-        # Access HDI data directly from data service
-        if data_service.hdi_data is None or data_service.hdi_data.empty:
-            return {"error": "No HDI data found"}
-        
-        hdi_data = data_service.hdi_data
-        sample_hdi = hdi_data.head(10).to_dict('records')
-        
-        return {
-            "total_hdi_records": len(hdi_data),
-            "columns": list(hdi_data.columns),
-            "sample_data": sample_hdi,
-            "unique_grids": len(hdi_data['priogrid_id'].unique()) if 'priogrid_id' in hdi_data.columns else 0,
-            "months_available": sorted(hdi_data['month_id'].unique().tolist()) if 'month_id' in hdi_data.columns else []
-        }
+        return await asyncio.to_thread(_summarize_hdi_data)
     except Exception as e:
         return {"error": str(e)}
 
 
-@app.get("/api/countries", response_model=List[Dict[str, Any]])
+@app.get("/api/countries")
 async def get_countries():
     """Get list of available countries."""
+    if "countries" in _info_cache:
+        return Response(content=_info_cache["countries"], media_type="application/json")
     try:
-        countries = forecast_service.get_countries()
-        return countries
+        content = await asyncio.to_thread(_serialize_countries)
     except Exception as e:
         logger.error(f"Error getting countries: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    if data_service.is_loaded:
+        _info_cache["countries"] = content
+    return Response(content=content, media_type="application/json")
+
+
+# Serve the dashboard (static/index.html) at "/"; mounted last so it never
+# shadows the API routes above
+app.mount("/", StaticFiles(directory="static", html=True), name="root")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop has no Windows build; fall back to the stock asyncio loop there
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )
\ No newline at end of file
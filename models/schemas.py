@@ -2,8 +2,8 @@
 Pydantic models for VIEWS API request/response schemas.
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Literal, Optional, Dict, Any
 from enum import Enum
 
 
@@ -28,6 +28,11 @@ class ConflictType(str, Enum):
     ONE_SIDED = "os"    # One-sided violence
 
 
+# Literal counterpart of ConflictType, used in the request/response models
+# so pydantic validates with a plain literal lookup rather than Enum coercion.
+ConflictTypeName = Literal["sb", "ns", "os"]
+
+
 class MetricSelection(BaseModel):
     """Metric selection for forecast queries."""
     include_map: bool = Field(True, description="Include MAP (mean) values")
@@ -35,14 +40,27 @@ class MetricSelection(BaseModel):
     include_hdi_90: bool = Field(True, description="Include 90% HDI bounds")
     include_hdi_99: bool = Field(False, description="Include 99% HDI bounds")
     include_thresholds: bool = Field(True, description="Include threshold probabilities")
-    conflict_types: List[ConflictType] = Field(
-        default=[ConflictType.STATE_BASED],
+    conflict_types: List[ConflictTypeName] = Field(
+        default=["sb"],
         description="Types of violence to include"
     )
 
+    def cache_key(self) -> tuple:
+        """Hashable key identifying this selection, for response caches."""
+        return (
+            self.include_map,
+            self.include_hdi_50,
+            self.include_hdi_90,
+            self.include_hdi_99,
+            self.include_thresholds,
+            tuple(self.conflict_types),
+        )
+
 
 class GridCellData(BaseModel):
     """Data for a single grid cell at a specific month."""
+    model_config = ConfigDict(frozen=True, extra='ignore', validate_assignment=False)
+
     grid_id: int = Field(..., description="PRIO Grid ID")
     month_id: int = Field(..., description="Month identifier")
     country_id: Optional[int] = Field(None, description="UN M49 country code")
@@ -71,20 +89,22 @@ class GridCellData(BaseModel):
     threshold_6: Optional[float] = Field(None, description="Probability > threshold 6")
     
     # Conflict type specific data
-    conflict_type: Optional[ConflictType] = Field(None, description="Type of violence")
+    conflict_type: Optional[ConflictTypeName] = Field(None, description="Type of violence")
     
     # Additional metadata
     country_name: Optional[str] = Field(None, description="Country name")
     year: Optional[int] = Field(None, description="Year")
     month: Optional[int] = Field(None, description="Month (1-12)")
 
-    @validator('latitude')
+    @field_validator('latitude')
+    @classmethod
     def validate_latitude(cls, v):
         if v is not None and not -90 <= v <= 90:
             raise ValueError('Latitude must be between -90 and 90')
         return v
 
-    @validator('longitude')
+    @field_validator('longitude')
+    @classmethod
     def validate_longitude(cls, v):
         if v is not None and not -180 <= v <= 180:
             raise ValueError('Longitude must be between -180 and 180')
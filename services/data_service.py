@@ -5,15 +5,69 @@ Handles data loading, caching, and basic data operations.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+import hashlib
 import logging
 import json
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from utils.exceptions import DataNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# On-disk memo of fully loaded data, keyed by the source files' mtime and size.
+# Bump the version whenever the in-memory layout of the loaded frames changes.
+LOAD_CACHE_DIR = Path(".cache")
+LOAD_CACHE_VERSION = 6
+
+# Per-instance LRU size for repeated grid and coordinate queries
+QUERY_CACHE_SIZE = 256
+
+# Narrow integer dtypes for ID-like columns. Signed, because month IDs take
+# part in offset arithmetic; float columns stay float64 so served values are
+# unchanged.
+COLUMN_DTYPES = {
+    'pg_id': 'int32',
+    'priogrid_id': 'int32',
+    'month_id': 'int16',
+    'country_id': 'int16',
+    'gwcode': 'int16',
+    'row': 'int16',
+    'col': 'int16',
+    'year': 'int16',
+    'month': 'int16',
+}
+
+# ID columns stored as dictionary-encoded categoricals, per data set
+PGM_ID_COLUMNS = ['pg_id', 'month_id', 'country_id']
+HDI_ID_COLUMNS = ['priogrid_id']
+TIMESERIES_ID_COLUMNS = ['priogrid_id']
+
+# Multi-threaded Arrow CSV reader settings; gzip is detected from the extension
+CSV_READ_OPTIONS = pa_csv.ReadOptions(use_threads=True, block_size=8 << 20)
+
+# Columns referenced downstream; everything else is left on disk when reading
+# the Parquet copies. None keeps every column.
+PGM_COLUMNS = ['pg_id', 'month_id', 'main_mean_ln', 'main_dich', 'main_mean', 'country_id']
+COUNTRY_COLUMNS = [
+    'country_id', 'month_id', 'country', 'gwcode', 'isoab', 'year', 'month',
+    'main_mean', 'main_dich', 'main_mean_ln'
+]
+HDI_COLUMNS = None
+TIMESERIES_COLUMNS = [
+    'priogrid_id', 'country_id', 'lat', 'lon', 'latitude', 'longitude', 'row', 'col', 'month_id'
+]
+# Metadata columns of the array-format timeseries file
+TIMESERIES_META_COLUMNS = ['priogrid_id', 'country_id', 'lat', 'lon', 'row', 'col', 'month_id']
+
 
 @dataclass
 class DataPaths:
@@ -25,149 +79,382 @@ class DataPaths:
 
 
 class DataService:
-    """Service for data loading and management."""
+    """
+    Service for data loading and management.
+    
+    Frames returned by the get_* methods may share memory with the loaded
+    data and must be treated as read-only by callers.
+    """
     
     def __init__(self, data_paths: Optional[DataPaths] = None):
         """Initialize data service."""
         self.data_paths = data_paths or DataPaths()
         self.pgm_data: Optional[pd.DataFrame] = None
         self.country_data: Optional[pd.DataFrame] = None
-        self.hdi_data: Optional[pd.DataFrame] = None
+        # HDI data is the largest file and only needed by forecast enrichment,
+        # so it is read on first access (see the hdi_data property)
+        self._hdi_data: Optional[pd.DataFrame] = None
+        self._hdi_loaded = False
+        self._hdi_lock = threading.Lock()
         self.timeseries_data: Optional[pd.DataFrame] = None
-        self.country_grid_mapping: Dict[int, List[int]] = {}
+        self.country_grid_mapping: Dict[int, np.ndarray] = {}
+        # Sorted-key row indexes over the ID columns, rebuilt when a frame is replaced
+        self._row_indexes: Dict[str, Tuple[pd.DataFrame, np.ndarray, np.ndarray]] = {}
+        # Decoded per-month slices of pgm_data, rebuilt when the frame is replaced
+        self._month_slices: Optional[Tuple[pd.DataFrame, Dict[int, pd.DataFrame]]] = None
+        self._reset_query_caches()
         self.is_loaded = False
     
     def load_data(self) -> None:
         """Load all data files."""
+        self._reset_query_caches()
+        self._hdi_data = None
+        self._hdi_loaded = False
         try:
-            self._load_pgm_data()
-            self._load_country_data()
-            self._load_hdi_data()
-            self._load_timeseries_data()
+            cache_key = self._load_cache_key()
+            if cache_key is not None and self._restore_load_cache(cache_key):
+                self.is_loaded = True
+                logger.info("All data loaded from cache")
+                return
+            
+            # The loaders are independent and spend most of their time in
+            # Arrow's CSV/Parquet readers, which release the GIL
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="data-load") as pool:
+                pgm_loaded = pool.submit(self._load_pgm_data)
+                loads = [
+                    pgm_loaded,
+                    pool.submit(self._load_country_data),
+                    pool.submit(self._load_timeseries_data, pgm_loaded),
+                ]
+                for load in loads:
+                    load.result()
             self._create_mappings()
             self.is_loaded = True
+            if cache_key is not None:
+                self._store_load_cache(cache_key)
             logger.info("All data loaded successfully")
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise
     
+    @property
+    def hdi_data(self) -> Optional[pd.DataFrame]:
+        """HDI interval data, read from disk the first time it is needed after load_data."""
+        if self.is_loaded and not self._hdi_loaded:
+            with self._hdi_lock:
+                if not self._hdi_loaded:
+                    self._load_hdi_data()
+                    self._hdi_loaded = True
+        return self._hdi_data
+    
+    @hdi_data.setter
+    def hdi_data(self, value: Optional[pd.DataFrame]) -> None:
+        self._hdi_data = value
+        self._hdi_loaded = True
+    
+    @property
+    def loaded_hdi_data(self) -> Optional[pd.DataFrame]:
+        """HDI interval data if it has been read already; never triggers the lazy load."""
+        return self._hdi_data if self._hdi_loaded else None
+    
+    def _reset_query_caches(self) -> None:
+        """(Re)create the query result caches; called whenever data is (re)loaded."""
+        self._grid_data_cache = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._query_grid_data)
+        self._coordinates_cache = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._query_coordinates)
+        # Summaries of the loaded data, which does not change until the next load
+        self._available_months_cache = lru_cache(maxsize=1)(self._query_available_months)
+        self._month_array_cache = lru_cache(maxsize=1)(self._query_month_array)
+        self._available_countries_cache = lru_cache(maxsize=1)(self._query_available_countries)
+        self._country_grid_counts_cache = lru_cache(maxsize=1)(self._query_country_grid_counts)
+        self._country_map_cache = lru_cache(maxsize=1)(self._query_country_map)
+    
+    def _load_cache_key(self) -> Optional[str]:
+        """Key for the load memo, or None when a source file is missing."""
+        # HDI data is loaded lazily and not part of the memo
+        paths = [
+            self.data_paths.pgm_data,
+            self.data_paths.country_data,
+            self.data_paths.timeseries_data,
+        ]
+        try:
+            sources = [self._source_path(p) for p in paths]
+            stats = [(str(p), os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in sources]
+        except OSError:
+            return None
+        # Column selections change what gets loaded, so they are part of the key
+        columns = (PGM_COLUMNS, COUNTRY_COLUMNS, TIMESERIES_COLUMNS)
+        return hashlib.sha1(repr((LOAD_CACHE_VERSION, stats, columns)).encode()).hexdigest()
+    
+    def _restore_load_cache(self, cache_key: str) -> bool:
+        """Populate the data frames from the load memo, if present."""
+        cache_path = LOAD_CACHE_DIR / f"{cache_key}.pkl"
+        if not cache_path.exists():
+            return False
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable load cache {cache_path}: {e}")
+            return False
+        
+        self.pgm_data = cached['pgm_data']
+        self.country_data = cached['country_data']
+        self.timeseries_data = cached['timeseries_data']
+        self.country_grid_mapping = self._pack_grid_mapping(cached['country_grid_mapping'])
+        return True
+    
+    def _store_load_cache(self, cache_key: str) -> None:
+        """Write the loaded data frames to the load memo (atomically)."""
+        cache_path = LOAD_CACHE_DIR / f"{cache_key}.pkl"
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            LOAD_CACHE_DIR.mkdir(exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    'pgm_data': self.pgm_data,
+                    'country_data': self.country_data,
+                    'timeseries_data': self.timeseries_data,
+                    'country_grid_mapping': self.country_grid_mapping,
+                }, f, protocol=5)
+            os.replace(tmp_path, cache_path)
+            # Drop memos for older versions of the source files
+            for stale in LOAD_CACHE_DIR.glob("*.pkl"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not write load cache {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _parquet_path(csv_path: str) -> Path:
+        """Path of the Parquet copy kept next to a (possibly gzipped) CSV file."""
+        path = Path(csv_path)
+        name = path.name
+        for suffix in ('.gz', '.csv'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        return path.with_name(f"{name}.parquet")
+    
+    @classmethod
+    def _source_path(cls, csv_path: str) -> Path:
+        """The file a data source is read from: the CSV, or its Parquet copy if only that is deployed."""
+        path = Path(csv_path)
+        if not path.exists() and cls._parquet_path(csv_path).exists():
+            return cls._parquet_path(csv_path)
+        return path
+    
+    @classmethod
+    def _source_exists(cls, csv_path: str) -> bool:
+        """Whether a data source is available as CSV or as a Parquet copy."""
+        return cls._source_path(csv_path).exists()
+    
+    @staticmethod
+    def _source_fingerprint(csv_path: str) -> Dict[bytes, bytes]:
+        """Size and mtime of a CSV file, as stored in the metadata of its Parquet copy."""
+        stat = os.stat(csv_path)
+        return {
+            b'source_size': str(stat.st_size).encode(),
+            b'source_mtime_ns': str(stat.st_mtime_ns).encode(),
+        }
+    
+    def _read_table(self, csv_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a data file, preferring its Parquet copy.
+        
+        The Parquet file may also be deployed on its own, without the CSV.
+        Next to a CSV, the copy is used only if the size and mtime recorded in
+        its metadata match the CSV exactly; otherwise the CSV is parsed (with
+        the multi-threaded Arrow reader) and a fresh copy (all columns) is
+        written for the next load. Parsing streams record batches through
+        gzip decompression straight into the Parquet writer, so only the
+        requested columns are ever held in memory in full.
+        """
+        parquet_path = self._parquet_path(csv_path)
+        fingerprint = self._source_fingerprint(csv_path) if Path(csv_path).exists() else None
+        if parquet_path.exists():
+            schema = pq.read_schema(parquet_path)
+            metadata = schema.metadata or {}
+            if fingerprint is None or all(metadata.get(k) == v for k, v in fingerprint.items()):
+                if columns is not None:
+                    columns = [c for c in columns if c in schema.names]
+                return pd.read_parquet(parquet_path, columns=columns)
+        
+        try:
+            table = self._stream_csv(csv_path, parquet_path, columns, fingerprint)
+        except pa.ArrowInvalid as e:
+            # Streaming infers column types from the first block only; a
+            # column that changes type later needs the whole-file reader
+            logger.warning(f"Streaming parse of {csv_path} failed ({e}); reading it whole")
+            table = pa_csv.read_csv(csv_path, read_options=CSV_READ_OPTIONS)
+            try:
+                pq.write_table(
+                    table.replace_schema_metadata({**(table.schema.metadata or {}), **fingerprint}),
+                    parquet_path,
+                    compression='zstd'
+                )
+                logger.info(f"Wrote Parquet copy of {csv_path} to {parquet_path}")
+            except Exception as write_error:
+                logger.warning(f"Could not write Parquet copy of {csv_path}: {write_error}")
+            if columns is not None:
+                table = table.select([c for c in columns if c in table.column_names])
+        
+        df = table.to_pandas(self_destruct=True)
+        del table
+        return df
+    
+    @staticmethod
+    def _stream_csv(
+        csv_path: str,
+        parquet_path: Path,
+        columns: Optional[List[str]],
+        fingerprint: Dict[bytes, bytes]
+    ) -> pa.Table:
+        """
+        Stream a (gzipped) CSV into a Parquet copy, returning only `columns` as a table.
+        
+        `fingerprint` (see _source_fingerprint) is stored in the copy's schema metadata.
+        """
+        # Types are inferred from the first block only, so integer-looking
+        # measurement columns are read as float64 up front in case later
+        # blocks hold fractional values; known ID columns stay integers
+        inferred = pa_csv.open_csv(csv_path, read_options=CSV_READ_OPTIONS).schema
+        column_types = {
+            field.name: pa.float64()
+            for field in inferred
+            if pa.types.is_integer(field.type) and field.name not in COLUMN_DTYPES
+        }
+        reader = pa_csv.open_csv(
+            csv_path,
+            read_options=CSV_READ_OPTIONS,
+            convert_options=pa_csv.ConvertOptions(column_types=column_types)
+        )
+        keep = reader.schema.names
+        if columns is not None:
+            keep = [c for c in columns if c in keep]
+        
+        tmp_path = parquet_path.with_suffix(f".{os.getpid()}.tmp")
+        writer = None
+        try:
+            writer = pq.ParquetWriter(
+                tmp_path,
+                reader.schema.with_metadata({**(reader.schema.metadata or {}), **fingerprint}),
+                compression='zstd'
+            )
+        except Exception as e:
+            logger.warning(f"Could not write Parquet copy of {csv_path}: {e}")
+        
+        batches = []
+        try:
+            for batch in reader:
+                if writer is not None:
+                    writer.write_batch(batch)
+                batches.append(batch.select(keep))
+            if writer is not None:
+                writer.close()
+                writer = None
+                os.replace(tmp_path, parquet_path)
+                logger.info(f"Wrote Parquet copy of {csv_path} to {parquet_path}")
+        finally:
+            if writer is not None:
+                writer.close()
+            tmp_path.unlink(missing_ok=True)
+        
+        schema = pa.schema([reader.schema.field(c) for c in keep])
+        return pa.Table.from_batches(batches, schema=schema)
+    
     def _load_pgm_data(self) -> None:
         """Load PRIO-GRID monthly data."""
-        if not Path(self.data_paths.pgm_data).exists():
+        if not self._source_exists(self.data_paths.pgm_data):
             self._create_synthetic_pgm_data()
         else:
-            self.pgm_data = pd.read_csv(self.data_paths.pgm_data)
+            self.pgm_data = self._read_table(self.data_paths.pgm_data, PGM_COLUMNS)
         
+        self._downcast_columns(self.pgm_data)
+        self._encode_id_columns(self.pgm_data, PGM_ID_COLUMNS)
         logger.info(f"Loaded PGM data: {len(self.pgm_data)} records")
     
     def _load_country_data(self) -> None:
         """Load country monthly data."""
-        if not Path(self.data_paths.country_data).exists():
+        if not self._source_exists(self.data_paths.country_data):
             self._create_synthetic_country_data()
         else:
-            self.country_data = pd.read_csv(self.data_paths.country_data)
+            self.country_data = self._read_table(self.data_paths.country_data, COUNTRY_COLUMNS)
         
+        self._downcast_columns(self.country_data)
         logger.info(f"Loaded country data: {len(self.country_data)} records")
     
     def _load_hdi_data(self) -> None:
         """Load HDI confidence interval data."""
-        if not Path(self.data_paths.hdi_data).exists():
+        if not self._source_exists(self.data_paths.hdi_data):
             logger.warning(f"HDI data file not found: {self.data_paths.hdi_data}")
             self._create_synthetic_hdi_data()
         else:
             try:
-                self.hdi_data = pd.read_csv(self.data_paths.hdi_data)
-                logger.info(f"Successfully loaded HDI data: {len(self.hdi_data)} records")
-                logger.info(f"HDI data columns: {list(self.hdi_data.columns)}")
+                self._hdi_data = self._read_table(self.data_paths.hdi_data, HDI_COLUMNS)
+                logger.info(f"Successfully loaded HDI data: {len(self._hdi_data)} records")
+                logger.info(f"HDI data columns: {list(self._hdi_data.columns)}")
             except Exception as e:
                 logger.error(f"Error loading HDI data: {e}")
                 self._create_synthetic_hdi_data()
         
-        if self.hdi_data is not None:
-            logger.info(f"Final HDI data: {len(self.hdi_data)} records")
+        if self._hdi_data is not None:
+            self._downcast_columns(self._hdi_data)
+            self._encode_id_columns(self._hdi_data, HDI_ID_COLUMNS)
+            logger.info(f"Final HDI data: {len(self._hdi_data)} records")
         else:
             logger.error("HDI data is None after loading")
     
-    def _load_timeseries_data(self) -> None:
-        """Load time series data with coordinates."""
-        if not Path(self.data_paths.timeseries_data).exists():
+    def _load_timeseries_data(self, pgm_loaded: Optional[Future] = None) -> None:
+        """
+        Load time series data with coordinates.
+        
+        `pgm_loaded` is the PGM load when it runs concurrently; it is only
+        waited on if coordinates have to be synthesized from the PGM grid cells.
+        """
+        if not self._source_exists(self.data_paths.timeseries_data):
             self._create_synthetic_timeseries_data()
         else:
             try:
                 # Try to parse the actual timeseries file
                 # First try reading as standard CSV (pandas handles .gz automatically)
-                self.timeseries_data = pd.read_csv(self.data_paths.timeseries_data)
+                self.timeseries_data = self._read_table(
+                    self.data_paths.timeseries_data, TIMESERIES_COLUMNS
+                )
                 logger.info(f"Loaded timeseries data as standard CSV: {len(self.timeseries_data)} records")
             except Exception as csv_error:
                 logger.warning(f"Failed to load as standard CSV: {csv_error}")
                 try:
-                    # Fallback: Try special handling for complex array format
-                    import gzip
-
-                    # Open gzipped file properly
-                    if self.data_paths.timeseries_data.endswith('.gz'):
-                        with gzip.open(self.data_paths.timeseries_data, 'rt', encoding='utf-8') as f:
-                            first_line = f.readline()
-                    else:
-                        with open(self.data_paths.timeseries_data, 'r', encoding='utf-8') as f:
-                            first_line = f.readline()
-
-                    # Check if it's the array format you showed
-                    if '[' in first_line and ']' in first_line:
-                        # This is the complex array format - extract just the metadata
-                        data = []
-
-                        if self.data_paths.timeseries_data.endswith('.gz'):
-                            with gzip.open(self.data_paths.timeseries_data, 'rt', encoding='utf-8') as f:
-                                lines = f.readlines()
-                        else:
-                            with open(self.data_paths.timeseries_data, 'r', encoding='utf-8') as f:
-                                lines = f.readlines()
-
-                        # Skip header if present
-                        start_idx = 1 if 'pred_ln_sb_best' in lines[0] else 0
-
-                        for line in lines[start_idx:]:
-                            parts = line.strip().split(',')
-                            if len(parts) >= 10:  # Ensure we have enough columns
-                                try:
-                                    # Extract the metadata columns (country_id, lat, lon, row, col, month_id, priogrid_id)
-                                    # Based on your format: ..., country_id, lat, lon, row, col, month_id, priogrid_id
-                                    country_id = int(parts[-7])
-                                    lat = float(parts[-6])
-                                    lon = float(parts[-5])
-                                    row = int(parts[-4])
-                                    col = int(parts[-3])
-                                    month_id = int(parts[-2])
-                                    priogrid_id = int(parts[-1])
-
-                                    data.append({
-                                        'priogrid_id': priogrid_id,
-                                        'latitude': lat,
-                                        'longitude': lon,
-                                        'country_id': country_id,
-                                        'row': row,
-                                        'col': col,
-                                        'month_id': month_id
-                                    })
-                                except (ValueError, IndexError) as e:
-                                    logger.warning(f"Skipping malformed line: {e}")
-                                    continue
-
-                        self.timeseries_data = pd.DataFrame(data)
-                        logger.info(f"Parsed timeseries data: {len(self.timeseries_data)} records")
-                    else:
-                        # Standard CSV format - try pandas read_csv again with explicit encoding
-                        self.timeseries_data = pd.read_csv(self.data_paths.timeseries_data, encoding='utf-8')
-
-                except Exception as e:
-                    logger.warning(f"Failed to load timeseries data: {e}, creating synthetic data")
-                    self._create_synthetic_timeseries_data()
+                    # Fallback for the array format: pull out just the metadata
+                    # columns, leaving the prediction arrays unparsed
+                    table = pa_csv.read_csv(
+                        self.data_paths.timeseries_data,
+                        read_options=CSV_READ_OPTIONS,
+                        convert_options=pa_csv.ConvertOptions(include_columns=TIMESERIES_META_COLUMNS)
+                    )
+                    self.timeseries_data = table.to_pandas(self_destruct=True)
+                    logger.info(f"Parsed timeseries data: {len(self.timeseries_data)} records")
+                except Exception as arrow_error:
+                    logger.warning(f"Failed to parse timeseries metadata columns: {arrow_error}")
+                    try:
+                        # Last resort: the C parser, still restricted to the columns we use
+                        self.timeseries_data = pd.read_csv(
+                            self.data_paths.timeseries_data,
+                            usecols=lambda c: c in TIMESERIES_COLUMNS,
+                            engine='c'
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to load timeseries data: {e}, creating synthetic data")
+                        self._create_synthetic_timeseries_data()
         
         # If we have no coordinate data, create synthetic coordinates for the grid cells we do have
         if self.timeseries_data is None or self.timeseries_data.empty:
+            if pgm_loaded is not None:
+                pgm_loaded.result()
             self._create_synthetic_coordinates_from_pgm()
         
+        self._normalize_coordinate_columns(self.timeseries_data)
+        self._downcast_columns(self.timeseries_data)
+        self._encode_id_columns(self.timeseries_data, TIMESERIES_ID_COLUMNS)
         logger.info(f"Loaded timeseries data: {len(self.timeseries_data)} records")
     
     def _create_synthetic_coordinates_from_pgm(self) -> None:
@@ -176,25 +463,20 @@ class DataService:
             return
             
         unique_grids = self.pgm_data['pg_id'].unique()
-        np.random.seed(42)  # For reproducible coordinates
-        
-        data = []
-        for i, grid_id in enumerate(unique_grids):
-            # Generate realistic global coordinates
-            lat = np.random.uniform(-60, 70)  # Avoid extreme polar regions
-            lon = np.random.uniform(-180, 180)
-            
-            data.append({
-                'priogrid_id': grid_id,
-                'latitude': lat,
-                'longitude': lon,
-                'country_id': (i % 5) + 1,  # Assign to 5 synthetic countries
-                'row': 100 + i // 10,
-                'col': 400 + i % 10
-            })
-        
-        self.timeseries_data = pd.DataFrame(data)
-        logger.info(f"Created synthetic coordinates for {len(unique_grids)} grid cells")
+        rng = np.random.default_rng(42)  # For reproducible coordinates
+        n = len(unique_grids)
+        idx = np.arange(n)
+        
+        # Realistic global coordinates, avoiding extreme polar regions
+        self.timeseries_data = pd.DataFrame({
+            'priogrid_id': unique_grids,
+            'latitude': rng.uniform(-60, 70, n),
+            'longitude': rng.uniform(-180, 180, n),
+            'country_id': (idx % 5) + 1,  # Assign to 5 synthetic countries
+            'row': 100 + idx // 10,
+            'col': 400 + idx % 10
+        })
+        logger.info(f"Created synthetic coordinates for {n} grid cells")
     
     def _create_mappings(self) -> None:
         """Create lookup mappings for efficient querying."""
@@ -204,15 +486,17 @@ class DataService:
         # Check if country_id exists in PGM data
         if 'country_id' in self.pgm_data.columns:
             # Create country to grid mapping from PGM data
-            country_groups = self.pgm_data.groupby('country_id')['pg_id'].apply(list)
-            self.country_grid_mapping = country_groups.to_dict()
+            self.country_grid_mapping = self._group_grid_ids(
+                self.pgm_data['country_id'], self.pgm_data['pg_id']
+            )
         else:
             # Create mapping using timeseries data (which has country_id)
             if self.timeseries_data is not None and 'country_id' in self.timeseries_data.columns:
                 # Map from timeseries data using priogrid_id
-                country_grid_df = self.timeseries_data[['country_id', 'priogrid_id']].drop_duplicates()
-                country_groups = country_grid_df.groupby('country_id')['priogrid_id'].apply(list)
-                self.country_grid_mapping = country_groups.to_dict()
+                cids, pgids = self._unique_pairs(
+                    self.timeseries_data['country_id'], self.timeseries_data['priogrid_id']
+                )
+                self.country_grid_mapping = self._group_grid_ids(cids, pgids)
                 logger.info("Created country mapping from timeseries data")
             else:
                 # Fallback: create synthetic mapping
@@ -223,37 +507,218 @@ class DataService:
                 for i in range(5):
                     start_idx = i * grids_per_country
                     end_idx = start_idx + grids_per_country if i < 4 else len(unique_grids)
-                    self.country_grid_mapping[i + 1] = unique_grids[start_idx:end_idx].tolist()
+                    self.country_grid_mapping[i + 1] = np.asarray(unique_grids[start_idx:end_idx])
         
         # Remove None/NaN countries
-        self.country_grid_mapping = {
-            k: v for k, v in self.country_grid_mapping.items() 
+        self.country_grid_mapping = self._pack_grid_mapping({
+            int(k): v for k, v in self.country_grid_mapping.items()
             if pd.notna(k)
-        }
+        })
         
         logger.info(f"Created mappings for {len(self.country_grid_mapping)} countries")
     
+    @staticmethod
+    def _normalize_coordinate_columns(df: pd.DataFrame) -> None:
+        """
+        Store coordinates as latitude/longitude only, in place.
+        
+        Timeseries files name them lat/lon, latitude/longitude or both; with
+        both, a zero lat/lon falls back to latitude/longitude.
+        """
+        for short, full in (('lat', 'latitude'), ('lon', 'longitude')):
+            if short not in df.columns:
+                continue
+            if full in df.columns:
+                df[full] = df[short].where(df[short] != 0, df[full])
+            else:
+                df[full] = df[short]
+            del df[short]
+    
+    @staticmethod
+    def _downcast_columns(df: Optional[pd.DataFrame]) -> None:
+        """Narrow integer ID columns to the dtypes in COLUMN_DTYPES, in place, when the values fit."""
+        if df is None:
+            return
+        for column, dtype in COLUMN_DTYPES.items():
+            if column not in df.columns or df[column].dtype.kind not in 'iu' or df.empty:
+                continue
+            limits = np.iinfo(dtype)
+            if limits.min <= df[column].min() and df[column].max() <= limits.max:
+                df[column] = df[column].astype(dtype)
+    
+    @staticmethod
+    def _encode_id_columns(df: Optional[pd.DataFrame], columns: List[str]) -> None:
+        """Convert repeated ID columns to categoricals (small integer codes) in place."""
+        if df is None:
+            return
+        for column in columns:
+            if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+    
+    @staticmethod
+    def _decode_id_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Return query results with categorical ID columns back in their plain dtypes."""
+        dtypes = {}
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                has_missing = bool((df[column].cat.codes.to_numpy() < 0).any())
+                dtypes[column] = 'float64' if has_missing else df[column].cat.categories.dtype
+        return df.astype(dtypes) if dtypes else df
+    
+    @staticmethod
+    def _filter_rows(column: pd.Series, positions: np.ndarray, values) -> np.ndarray:
+        """Keep the row positions whose value in `column` is in `values`."""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            wanted = column.cat.categories.get_indexer(pd.Index(values).unique())
+            keys = column.cat.codes.to_numpy()[positions]
+            return positions[np.isin(keys, wanted[wanted >= 0])]
+        return positions[np.isin(column.to_numpy()[positions], values)]
+    
+    @staticmethod
+    def _as_key_dtype(values, dtype: np.dtype) -> np.ndarray:
+        """
+        `values` as an array of the index key dtype.
+        
+        searchsorted casts both operands to a common dtype, so int64 lookup
+        values against an int32 index would copy the whole index on every
+        call. Values outside the key dtype's range cannot match and are dropped.
+        """
+        wanted = np.asarray(values)
+        if wanted.dtype == dtype or dtype.kind not in 'iu' or wanted.dtype.kind not in 'iu':
+            return wanted
+        limits = np.iinfo(dtype)
+        wanted = wanted[(wanted >= limits.min) & (wanted <= limits.max)]
+        return wanted.astype(dtype)
+    
+    def _rows_for(self, name: str, df: pd.DataFrame, column: str, values) -> np.ndarray:
+        """
+        Row positions of `df` whose `column` value is in `values`, in file order.
+        
+        Uses a stably sorted copy of the column built once per frame, so a
+        lookup costs O(k log N) binary searches plus the size of the result
+        instead of a full-length boolean mask.
+        """
+        cached = self._row_indexes.get(name)
+        if cached is None or cached[0] is not df:
+            keys = np.asarray(df[column])
+            order = np.argsort(keys, kind='stable')
+            cached = (df, keys[order], order)
+            self._row_indexes[name] = cached
+        _, sorted_keys, order = cached
+        
+        wanted = self._as_key_dtype(values, sorted_keys.dtype)
+        if len(wanted) > 1:
+            wanted = np.unique(wanted)
+        left = np.searchsorted(sorted_keys, wanted, side='left')
+        right = np.searchsorted(sorted_keys, wanted, side='right')
+        lengths = right - left
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp)
+        
+        # Expand the [left, right) ranges into one flat array of sorted offsets
+        range_starts = np.cumsum(lengths) - lengths
+        offsets = np.arange(total) - np.repeat(range_starts, lengths)
+        positions = order[np.repeat(left, lengths) + offsets]
+        if total * 16 < len(order):
+            return np.sort(positions)
+        # Large results: scattering into a mask is cheaper than sorting
+        mask = np.zeros(len(order), dtype=bool)
+        mask[positions] = True
+        return np.flatnonzero(mask)
+    
+    def _pgm_month_slices(self) -> Dict[int, pd.DataFrame]:
+        """
+        pgm_data split by month_id, built once per frame.
+        
+        There are only a few dozen months, so holding one decoded slice per
+        month costs about one extra copy of pgm_data and turns every month
+        lookup into a dict access.
+        """
+        if self._month_slices is None or self._month_slices[0] is not self.pgm_data:
+            slices = {
+                int(month): self._decode_id_columns(group)
+                for month, group in self.pgm_data.groupby('month_id', sort=False, observed=True)
+            }
+            self._month_slices = (self.pgm_data, slices)
+        return self._month_slices[1]
+    
+    @staticmethod
+    def _pack_grid_mapping(mapping: Dict[int, np.ndarray]) -> Dict[int, np.ndarray]:
+        """
+        Lay the per-country grid IDs out back to back in one int32 array.
+        
+        Each country maps to a slice (view) of the shared array, CSR style, so
+        the mapping is one contiguous buffer rather than one allocation per
+        country. The buffer is read-only since the views are handed out by
+        get_country_grids.
+        """
+        if not mapping:
+            return {}
+        lengths = [len(ids) for ids in mapping.values()]
+        flat = np.concatenate([np.asarray(ids, dtype=np.int32) for ids in mapping.values()])
+        flat.flags.writeable = False
+        ends = np.cumsum(lengths)
+        return {
+            country_id: flat[end - length:end]
+            for country_id, length, end in zip(mapping, lengths, ends)
+        }
+    
+    @staticmethod
+    def _unique_pairs(country_ids: pd.Series, grid_ids: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distinct (country, grid) pairs in order of first appearance.
+        
+        Integer IDs (at most 32 bits each) are packed into one int64 key so a
+        single hash pass over a flat array replaces drop_duplicates' per-row
+        hashing; other dtypes (e.g. country IDs with missing values) fall back
+        to drop_duplicates.
+        """
+        cids = country_ids.to_numpy()
+        pgids = grid_ids.to_numpy()
+        if (cids.dtype.kind not in 'iu' or pgids.dtype.kind not in 'iu'
+                or cids.dtype.itemsize > 4 or pgids.dtype.itemsize > 4):
+            pairs = pd.DataFrame({'c': cids, 'p': pgids}).drop_duplicates()
+            return pairs['c'].to_numpy(), pairs['p'].to_numpy()
+        keys = pd.unique((cids.astype(np.int64) << 32) | (pgids.astype(np.int64) & 0xFFFFFFFF))
+        low = (keys & 0xFFFFFFFF).astype(np.uint32)
+        if pgids.dtype.kind == 'i':
+            low = low.view(np.int32)
+        return (keys >> 32).astype(cids.dtype), low.astype(pgids.dtype)
+    
+    @staticmethod
+    def _group_grid_ids(country_ids, grid_ids) -> Dict[int, np.ndarray]:
+        """Group grid IDs by country with one stable argsort, keeping row order within a country."""
+        cids = np.asarray(country_ids)
+        pgids = np.asarray(grid_ids)
+        order = np.argsort(cids, kind='stable')
+        cids_sorted, pgids_sorted = cids[order], pgids[order]
+        uniq, starts = np.unique(cids_sorted, return_index=True)
+        splits = np.split(pgids_sorted, starts[1:])
+        return {
+            int(c): p
+            for c, p in zip(uniq, splits)
+            if pd.notna(c)
+        }
+    
     def _create_synthetic_pgm_data(self) -> None:
         """Create synthetic PGM data for testing."""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         
         # Generate grid cells and months
-        grid_ids = range(62356, 62456)  # 100 grid cells
-        month_ids = range(548, 584)     # 36 months
-        
-        data = []
-        for grid_id in grid_ids:
-            for month_id in month_ids:
-                data.append({
-                    'pg_id': grid_id,
-                    'month_id': month_id,
-                    'main_mean_ln': np.random.exponential(0.01),
-                    'main_dich': np.random.beta(2, 20),
-                    'main_mean': np.random.exponential(0.01),
-                    'country_id': np.random.choice([1, 2, 3, 4, 5])
-                })
-        
-        self.pgm_data = pd.DataFrame(data)
+        grid_ids = np.arange(62356, 62456)  # 100 grid cells
+        month_ids = np.arange(548, 584)     # 36 months
+        gi, mi = np.meshgrid(grid_ids, month_ids, indexing='ij')
+        n = gi.size
+        
+        self.pgm_data = pd.DataFrame({
+            'pg_id': gi.ravel(),
+            'month_id': mi.ravel(),
+            'main_mean_ln': rng.exponential(0.01, n),
+            'main_dich': rng.beta(2, 20, n),
+            'main_mean': rng.exponential(0.01, n),
+            'country_id': rng.choice([1, 2, 3, 4, 5], n)
+        })
         
         # Save for future use
         Path("data").mkdir(exist_ok=True)
@@ -261,30 +726,28 @@ class DataService:
     
     def _create_synthetic_country_data(self) -> None:
         """Create synthetic country data for testing."""
-        countries = [
+        countries = pd.DataFrame([
             {'country_id': 1, 'country': 'Testland', 'isoab': 'TST', 'gwcode': 100},
             {'country_id': 2, 'country': 'Democracia', 'isoab': 'DEM', 'gwcode': 101},
             {'country_id': 3, 'country': 'Republica', 'isoab': 'REP', 'gwcode': 102},
             {'country_id': 4, 'country': 'Federation', 'isoab': 'FED', 'gwcode': 103},
             {'country_id': 5, 'country': 'Kingdom', 'isoab': 'KNG', 'gwcode': 104},
-        ]
+        ])
+        rng = np.random.default_rng()
         
-        month_ids = range(548, 584)
-        data = []
-        
-        for country in countries:
-            for month_id in month_ids:
-                data.append({
-                    **country,
-                    'month_id': month_id,
-                    'year': 2025 + (month_id - 548) // 12,
-                    'month': ((month_id - 548) % 12) + 1,
-                    'main_mean': np.random.exponential(0.05),
-                    'main_dich': np.random.beta(2, 20),
-                    'main_mean_ln': np.random.exponential(0.05),
-                })
+        month_ids = np.arange(548, 584)
+        data = countries.loc[countries.index.repeat(len(month_ids))].reset_index(drop=True)
+        n = len(data)
+        month_col = np.tile(month_ids, len(countries))
+        
+        data['month_id'] = month_col
+        data['year'] = 2025 + (month_col - 548) // 12
+        data['month'] = ((month_col - 548) % 12) + 1
+        data['main_mean'] = rng.exponential(0.05, n)
+        data['main_dich'] = rng.beta(2, 20, n)
+        data['main_mean_ln'] = rng.exponential(0.05, n)
         
-        self.country_data = pd.DataFrame(data)
+        self.country_data = data
         
         # Save for future use
         Path("data").mkdir(exist_ok=True)
@@ -292,86 +755,87 @@ class DataService:
     
     def _create_synthetic_hdi_data(self) -> None:
         """Create synthetic HDI data for testing."""
-        np.random.seed(42)
-        
-        grid_ids = range(62356, 62456)
-        month_ids = range(548, 584)
-        
-        data = []
-        for grid_id in grid_ids:
-            for month_id in month_ids:
-                base_prob = np.random.beta(2, 20)
-                data.append({
-                    'priogrid_id': grid_id,
-                    'month_id': month_id,
-                    'pred_ln_sb_best_hdi_lower': 0.0,
-                    'pred_ln_sb_best_hdi_upper': 0.0,
-                    'pred_ln_ns_best_hdi_lower': 0.0,
-                    'pred_ln_ns_best_hdi_upper': 0.0,
-                    'pred_ln_os_best_hdi_lower': 0.0,
-                    'pred_ln_os_best_hdi_upper': 0.0,
-                    'pred_ln_sb_prob_hdi_lower': max(0, base_prob - 0.01),
-                    'pred_ln_sb_prob_hdi_upper': min(1, base_prob + 0.01),
-                    'pred_ln_ns_prob_hdi_lower': max(0, base_prob - 0.005),
-                    'pred_ln_ns_prob_hdi_upper': min(1, base_prob + 0.005),
-                    'pred_ln_os_prob_hdi_lower': max(0, base_prob - 0.02),
-                    'pred_ln_os_prob_hdi_upper': min(1, base_prob + 0.02),
-                })
-        
-        self.hdi_data = pd.DataFrame(data)
+        rng = np.random.default_rng(42)
+        
+        grid_ids = np.arange(62356, 62456)
+        month_ids = np.arange(548, 584)
+        gi, mi = np.meshgrid(grid_ids, month_ids, indexing='ij')
+        n = gi.size
+        
+        base_prob = rng.beta(2, 20, n)
+        zeros = np.zeros(n)
+        self._hdi_data = pd.DataFrame({
+            'priogrid_id': gi.ravel(),
+            'month_id': mi.ravel(),
+            'pred_ln_sb_best_hdi_lower': zeros,
+            'pred_ln_sb_best_hdi_upper': zeros,
+            'pred_ln_ns_best_hdi_lower': zeros,
+            'pred_ln_ns_best_hdi_upper': zeros,
+            'pred_ln_os_best_hdi_lower': zeros,
+            'pred_ln_os_best_hdi_upper': zeros,
+            'pred_ln_sb_prob_hdi_lower': np.clip(base_prob - 0.01, 0, 1),
+            'pred_ln_sb_prob_hdi_upper': np.clip(base_prob + 0.01, 0, 1),
+            'pred_ln_ns_prob_hdi_lower': np.clip(base_prob - 0.005, 0, 1),
+            'pred_ln_ns_prob_hdi_upper': np.clip(base_prob + 0.005, 0, 1),
+            'pred_ln_os_prob_hdi_lower': np.clip(base_prob - 0.02, 0, 1),
+            'pred_ln_os_prob_hdi_upper': np.clip(base_prob + 0.02, 0, 1),
+        })
         
         # Save for future use
         Path("data").mkdir(exist_ok=True)
-        self.hdi_data.to_csv(self.data_paths.hdi_data, index=False)
+        self._hdi_data.to_csv(self.data_paths.hdi_data, index=False)
     
     def _create_synthetic_timeseries_data(self) -> None:
         """Create synthetic timeseries data with coordinates."""
-        np.random.seed(42)
-        
-        grid_ids = range(62356, 62456)
-        
-        data = []
-        for i, grid_id in enumerate(grid_ids):
-            # Generate realistic coordinates
-            lat = np.random.uniform(-60, 70)
-            lon = np.random.uniform(-180, 180)
-            
-            data.append({
-                'priogrid_id': grid_id,
-                'latitude': lat,
-                'longitude': lon,
-                'country_id': np.random.choice([1, 2, 3, 4, 5]),
-                'row': 100 + i // 10,
-                'col': 400 + i % 10
-            })
-        
-        self.timeseries_data = pd.DataFrame(data)
+        rng = np.random.default_rng(42)
+        
+        grid_ids = np.arange(62356, 62456)
+        n = len(grid_ids)
+        idx = np.arange(n)
+        
+        # Generate realistic coordinates
+        self.timeseries_data = pd.DataFrame({
+            'priogrid_id': grid_ids,
+            'latitude': rng.uniform(-60, 70, n),
+            'longitude': rng.uniform(-180, 180, n),
+            'country_id': rng.choice([1, 2, 3, 4, 5], n),
+            'row': 100 + idx // 10,
+            'col': 400 + idx % 10
+        })
     
     def get_grid_data(self, grid_ids: List[int], month_ids: Optional[List[int]] = None) -> pd.DataFrame:
         """Get data for specific grid cells and months."""
         if not self.is_loaded:
             raise DataNotFoundError("Data not loaded")
         
-        query = self.pgm_data['pg_id'].isin(grid_ids)
-        
-        if month_ids:
-            query &= self.pgm_data['month_id'].isin(month_ids)
-        
-        result = self.pgm_data[query].copy()
+        # Results are in file order, so the inputs' order doesn't matter to the key
+        result = self._grid_data_cache(
+            tuple(sorted(set(grid_ids))),
+            tuple(sorted(set(month_ids))) if month_ids else None
+        )
         
         if result.empty:
             raise DataNotFoundError(f"No data found for grid IDs: {grid_ids}")
         
         return result
     
-    def get_country_grids(self, country_id: int) -> List[int]:
-        """Get all grid IDs for a country."""
+    def _query_grid_data(self, grid_ids: Tuple[int, ...], month_ids: Optional[Tuple[int, ...]]) -> pd.DataFrame:
+        """Uncached body of get_grid_data."""
+        positions = self._rows_for('pgm', self.pgm_data, 'pg_id', grid_ids)
+        
+        if month_ids:
+            positions = self._filter_rows(self.pgm_data['month_id'], positions, month_ids)
+        
+        return self._decode_id_columns(self.pgm_data.iloc[positions])
+    
+    def get_country_grids(self, country_id: int) -> np.ndarray:
+        """Get all grid IDs for a country (as a read-only-by-contract int32 array)."""
         if not self.is_loaded:
             raise DataNotFoundError("Data not loaded")
         
-        grid_ids = self.country_grid_mapping.get(country_id, [])
+        grid_ids = self.country_grid_mapping.get(country_id)
         
-        if not grid_ids:
+        if grid_ids is None or len(grid_ids) == 0:
             raise DataNotFoundError(f"No grid cells found for country ID: {country_id}")
         
         return grid_ids
@@ -381,25 +845,23 @@ class DataService:
         if not self.is_loaded:
             raise DataNotFoundError("Data not loaded")
         
-        query = self.pgm_data['month_id'] == month_id
-        
-        if country_id:
-            # Check if country_id column exists in pgm_data
-            if 'country_id' in self.pgm_data.columns:
-                query &= self.pgm_data['country_id'] == country_id
+        if country_id and 'country_id' not in self.pgm_data.columns:
+            # Look up the grid IDs that belong to the country
+            try:
+                grid_ids = self.get_country_grids(country_id)
+            except DataNotFoundError:
+                # Country not found, return empty result
+                logger.warning(f"Country {country_id} not found in mappings")
+                return pd.DataFrame()
+        
+        result = self._pgm_month_slices().get(month_id)
+        if result is not None and country_id:
+            if 'country_id' in result.columns:
+                result = result[result['country_id'].to_numpy() == country_id]
             else:
-                # Filter by grid IDs that belong to the country
-                try:
-                    grid_ids = self.get_country_grids(country_id)
-                    query &= self.pgm_data['pg_id'].isin(grid_ids)
-                except DataNotFoundError:
-                    # Country not found, return empty result
-                    logger.warning(f"Country {country_id} not found in mappings")
-                    return pd.DataFrame()
+                result = result[np.isin(result['pg_id'].to_numpy(), grid_ids)]
         
-        result = self.pgm_data[query].copy()
-        
-        if result.empty:
+        if result is None or result.empty:
             raise DataNotFoundError(f"No data found for month ID: {month_id}")
         
         return result
@@ -409,27 +871,26 @@ class DataService:
         if self.hdi_data is None:
             return pd.DataFrame()
         
-        query = self.hdi_data['priogrid_id'].isin(grid_ids)
+        positions = self._rows_for('hdi', self.hdi_data, 'priogrid_id', grid_ids)
         
         if month_ids:
-            query &= self.hdi_data['month_id'].isin(month_ids)
+            positions = self._filter_rows(self.hdi_data['month_id'], positions, month_ids)
         
-        return self.hdi_data[query].copy()
+        return self._decode_id_columns(self.hdi_data.iloc[positions])
     
     def get_coordinates(self, grid_ids: List[int]) -> pd.DataFrame:
         """Get coordinates for grid cells."""
         if self.timeseries_data is None or self.timeseries_data.empty:
             return pd.DataFrame()
         
-        if not grid_ids:  # If no specific grid_ids requested, return all
-            return self.timeseries_data.copy()
+        if len(grid_ids) == 0:  # If no specific grid_ids requested, return all
+            return self._decode_id_columns(self.timeseries_data)
         
         # Match by priogrid_id (the coordinate data uses this field name)
-        query = self.timeseries_data['priogrid_id'].isin(grid_ids)
-        result = self.timeseries_data[query].copy()
+        result = self._coordinates_cache(tuple(sorted(set(grid_ids))))
         
         # Debug logging
-        logger.info(f"Coordinate lookup: requested {len(grid_ids)} grids, found {len(result)} matches")
+        logger.debug("Coordinate lookup: requested %d grids, found %d matches", len(grid_ids), len(result))
         if len(result) == 0 and len(self.timeseries_data) > 0:
             sample_coord_ids = self.timeseries_data['priogrid_id'].head(5).tolist()
             sample_request_ids = grid_ids[:5]
@@ -437,22 +898,53 @@ class DataService:
         
         return result
     
+    def _query_coordinates(self, grid_ids: Tuple[int, ...]) -> pd.DataFrame:
+        """Uncached body of get_coordinates for a non-empty grid ID selection."""
+        positions = self._rows_for('timeseries', self.timeseries_data, 'priogrid_id', grid_ids)
+        return self._decode_id_columns(self.timeseries_data.iloc[positions])
+    
     def get_available_months(self) -> List[int]:
         """Get list of available month IDs."""
         if not self.is_loaded or self.pgm_data is None:
             return []
         
-        return sorted(self.pgm_data['month_id'].unique().tolist())
+        return list(self._available_months_cache())
+    
+    def _query_available_months(self) -> Tuple[int, ...]:
+        """Uncached body of get_available_months."""
+        return tuple(sorted(self.pgm_data['month_id'].unique().tolist()))
+    
+    def get_months_in_range(
+        self, month_start: Optional[int] = None, month_end: Optional[int] = None
+    ) -> List[int]:
+        """Get the available month IDs from month_start to month_end, inclusive; a missing bound is open."""
+        if not self.is_loaded or self.pgm_data is None:
+            return []
+        
+        months = self._month_array_cache()
+        lo = np.searchsorted(months, month_start, side='left') if month_start else 0
+        hi = np.searchsorted(months, month_end, side='right') if month_end else len(months)
+        return months[lo:hi].tolist()
+    
+    def _query_month_array(self) -> np.ndarray:
+        """Uncached body of the sorted month ID array behind get_months_in_range."""
+        months = np.asarray(self._available_months_cache(), dtype=np.int64)
+        months.flags.writeable = False
+        return months
     
     def get_available_countries(self) -> List[Dict]:
         """Get list of available countries."""
         if not self.is_loaded:
             return []
         
+        return [dict(country) for country in self._available_countries_cache()]
+    
+    def _query_available_countries(self) -> Tuple[Dict, ...]:
+        """Uncached body of get_available_countries."""
         # First try to get countries from country_data (which should have country names)
         if self.country_data is not None:
             countries = self.country_data[['country_id', 'country', 'isoab']].drop_duplicates()
-            return countries.rename(columns={'isoab': 'iso_code'}).to_dict('records')
+            return tuple(countries.rename(columns={'isoab': 'iso_code'}).to_dict('records'))
         
         # Fallback: get countries from country mapping (might not have names)
         elif self.country_grid_mapping:
@@ -463,10 +955,32 @@ class DataService:
                     'country': f'Country {country_id}',  # Generic name
                     'iso_code': None
                 })
-            return countries
+            return tuple(countries)
         
         # Last resort: return empty list
-        return []
+        return ()
+    
+    def get_country_map(self) -> Dict[int, str]:
+        """Get a country ID -> country name mapping of the available countries."""
+        if not self.is_loaded:
+            return {}
+        
+        return dict(self._country_map_cache())
+    
+    def _query_country_map(self) -> Tuple[Tuple[int, str], ...]:
+        """Uncached body of get_country_map."""
+        return tuple((c['country_id'], c['country']) for c in self._available_countries_cache())
+    
+    def get_country_grid_counts(self) -> Dict[int, int]:
+        """Get the number of grid cells in each country in the country mapping."""
+        if not self.is_loaded:
+            return {}
+        
+        return dict(self._country_grid_counts_cache())
+    
+    def _query_country_grid_counts(self) -> Tuple[Tuple[int, int], ...]:
+        """Uncached body of get_country_grid_counts."""
+        return tuple((country_id, len(grid_ids)) for country_id, grid_ids in self.country_grid_mapping.items())
     
     def get_total_grid_cells(self) -> int:
         """Get total number of grid cells."""
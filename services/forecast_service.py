@@ -3,16 +3,67 @@ Forecast service layer for VIEWS API.
 Handles business logic for forecast queries and data enrichment.
 """
 
+import itertools
 import pandas as pd
 import numpy as np
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from models.schemas import GridCellData, MetricSelection, ConflictType
 from services.data_service import DataService
-from utils.exceptions import DataNotFoundError, ValidationError
+from utils.exceptions import ValidationError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on grid cells x months a single grid query may return
+MAX_GRID_QUERY_CELLS = 50_000
+
+# Offsets subtracted from (or, for upper bounds, added to) the base
+# probability by _generate_synthetic_metrics_batch, spread uniformly over [low, high)
+SYNTHETIC_METRIC_OFFSETS = {
+    'hdi_50_lower': (0.001, 0.005),
+    'hdi_50_upper': (0.001, 0.005),
+    'hdi_99_lower': (0.01, 0.03),
+    'hdi_99_upper': (0.01, 0.03),
+    'threshold_2': (0.001, 0.01),   # 5+ fatalities
+    'threshold_3': (0.01, 0.02),    # 10+ fatalities
+    'threshold_4': (0.02, 0.04),    # 25+ fatalities
+    'threshold_5': (0.03, 0.06),    # 100+ fatalities
+    'threshold_6': (0.05, 0.08),    # 1000+ fatalities
+}
+_SYNTHETIC_LOW, _SYNTHETIC_HIGH = np.array(list(SYNTHETIC_METRIC_OFFSETS.values())).T
+# Upper HDI bounds add their offset (clipped at 1); all other metrics subtract it (clipped at 0)
+_SYNTHETIC_SIGN = np.array([1.0 if name.endswith('_upper') else -1.0 for name in SYNTHETIC_METRIC_OFFSETS])
+
+# HDI interval columns -> GridCellData fields
+HDI_90_COLUMNS = {
+    'pred_ln_sb_prob_hdi_lower': 'hdi_90_lower',
+    'pred_ln_sb_prob_hdi_upper': 'hdi_90_upper',
+}
+
+
+# Month IDs count months from a fixed origin; month 548 is 2025-01 in the
+# forecasts' calendar
+BASE_MONTH_ID = 548
+BASE_YEAR = 2025
+
+
+def month_id_to_year_month(month_ids):
+    """
+    Convert month IDs to (year, month) with integer arithmetic.
+    
+    Works on scalars and, elementwise, on whole NumPy arrays or Series.
+    """
+    offset = month_ids - BASE_MONTH_ID
+    return BASE_YEAR + offset // 12, offset % 12 + 1
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer over an integer array (wrapping uint64 arithmetic)."""
+    h = np.asarray(values).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
 
 class ForecastService:
     """Service for forecast data processing and enrichment."""
@@ -29,15 +80,9 @@ class ForecastService:
         
         date_range = {}
         if months:
-            # Convert month IDs to readable dates (assuming month 548 = Aug 2025)
-            start_month = months[0]
-            end_month = months[-1]
-            
-            # Simple conversion (month 548 = 2025-08)
-            start_year = 2025 + (start_month - 548) // 12
-            start_month_num = ((start_month - 548) % 12) + 1
-            end_year = 2025 + (end_month - 548) // 12
-            end_month_num = ((end_month - 548) % 12) + 1
+            # Convert month IDs to readable dates
+            start_year, start_month_num = month_id_to_year_month(months[0])
+            end_year, end_month_num = month_id_to_year_month(months[-1])
             
             date_range = {
                 "start": f"{start_year}-{start_month_num:02d}",
@@ -59,20 +104,33 @@ class ForecastService:
         month_start: Optional[int] = None,
         month_end: Optional[int] = None,
         metrics: MetricSelection = MetricSelection()
-    ) -> List[GridCellData]:
-        """Get forecasts for all grid cells in a country."""
+    ) -> Tuple[List[GridCellData], int]:
+        """Get forecasts for all grid cells in a country, plus the number of months covered."""
+        records, months_covered = self.get_forecast_records_by_country(
+            country_id, month_start, month_end, metrics
+        )
+        return [GridCellData.model_construct(**record) for record in records], months_covered
+    
+    def get_forecast_records_by_country(
+        self, 
+        country_id: int, 
+        month_start: Optional[int] = None,
+        month_end: Optional[int] = None,
+        metrics: MetricSelection = MetricSelection()
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get country forecasts as plain dict records, plus the number of months covered."""
         # Get grid IDs for the country
         grid_ids = self.data_service.get_country_grids(country_id)
         
         # Filter months if specified
         month_ids = None
         if month_start or month_end:
-            all_months = self.data_service.get_available_months()
-            start = month_start or min(all_months)
-            end = month_end or max(all_months)
-            month_ids = [m for m in all_months if start <= m <= end]
+            month_ids = self.data_service.get_months_in_range(month_start, month_end)
+            if not month_ids:
+                # An empty month filter would otherwise match every month
+                return [], 0
         
-        return self._get_enriched_forecasts(grid_ids, month_ids, metrics)
+        return self._get_enriched_records(grid_ids, month_ids, metrics)
     
     def get_forecasts_by_grid(
         self,
@@ -80,17 +138,40 @@ class ForecastService:
         month_start: Optional[int] = None,
         month_end: Optional[int] = None,
         metrics: MetricSelection = MetricSelection()
-    ) -> List[GridCellData]:
-        """Get forecasts for specific grid cells."""
+    ) -> Tuple[List[GridCellData], int]:
+        """Get forecasts for specific grid cells, plus the number of months covered."""
+        records, months_covered = self.get_forecast_records_by_grid(
+            grid_ids, month_start, month_end, metrics
+        )
+        return [GridCellData.model_construct(**record) for record in records], months_covered
+    
+    def get_forecast_records_by_grid(
+        self,
+        grid_ids: List[int],
+        month_start: Optional[int] = None,
+        month_end: Optional[int] = None,
+        metrics: MetricSelection = MetricSelection()
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get grid cell forecasts as plain dict records, plus the number of months covered."""
         # Filter months if specified
         month_ids = None
         if month_start or month_end:
-            all_months = self.data_service.get_available_months()
-            start = month_start or min(all_months)
-            end = month_end or max(all_months)
-            month_ids = [m for m in all_months if start <= m <= end]
+            month_ids = self.data_service.get_months_in_range(month_start, month_end)
+            if not month_ids:
+                # An empty month filter would otherwise match every month
+                return [], 0
+        
+        months_requested = (
+            len(month_ids) if month_ids is not None
+            else len(self.data_service.get_available_months())
+        )
+        if len(grid_ids) * months_requested > MAX_GRID_QUERY_CELLS:
+            raise ValidationError(
+                f"Query would return up to {len(grid_ids) * months_requested} cells; "
+                f"narrow the grid IDs or month range (limit {MAX_GRID_QUERY_CELLS})"
+            )
         
-        return self._get_enriched_forecasts(grid_ids, month_ids, metrics)
+        return self._get_enriched_records(grid_ids, month_ids, metrics)
     
     def get_forecasts_by_month(
         self,
@@ -99,21 +180,87 @@ class ForecastService:
         metrics: MetricSelection = MetricSelection()
     ) -> List[GridCellData]:
         """Get forecasts for a specific month."""
+        records = self.get_forecast_records_by_month(month_id, country_id, metrics)
+        return [GridCellData.model_construct(**record) for record in records]
+    
+    def get_forecast_records_by_month(
+        self,
+        month_id: int,
+        country_id: Optional[int] = None,
+        metrics: MetricSelection = MetricSelection()
+    ) -> List[Dict[str, Any]]:
+        """Get forecasts for a specific month as plain dict records."""
         # Get data for the month
         month_data = self.data_service.get_month_data(month_id, country_id)
         grid_ids = month_data['pg_id'].tolist()
         
-        return self._get_enriched_forecasts(grid_ids, [month_id], metrics)
+        records, _ = self._get_enriched_records(grid_ids, [month_id], metrics)
+        return records
+    
+    def get_forecasts_by_month_df(
+        self,
+        month_id: int,
+        country_id: Optional[int] = None,
+        metrics: MetricSelection = MetricSelection()
+    ) -> pd.DataFrame:
+        """
+        Get forecasts for a specific month as a DataFrame of GridCellData columns.
+        
+        Built column-wise from the enriched frame, without going through
+        per-cell records, for the Parquet/Arrow responses.
+        """
+        month_data = self.data_service.get_month_data(month_id, country_id)
+        merged, _ = self._enrich(month_data['pg_id'].tolist(), [month_id], metrics)
+        return self._forecast_frame(merged, metrics)
+    
+    def iter_forecast_records_by_month(
+        self,
+        month_id: int,
+        country_id: Optional[int] = None,
+        metrics: MetricSelection = MetricSelection(),
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield forecasts for a specific month in batches of dict records.
+        
+        The month is enriched once, with the same lookups as the other month
+        queries, and only the record building is done per batch.
+        """
+        month_data = self.data_service.get_month_data(month_id, country_id)
+        merged, _ = self._enrich(month_data['pg_id'].tolist(), [month_id], metrics)
+        
+        for start in range(0, len(merged), batch_size):
+            yield self._grid_cell_records(merged.iloc[start:start + batch_size], metrics)
     
-    def _get_enriched_forecasts(
+    def _get_enriched_records(
         self,
         grid_ids: List[int],
         month_ids: Optional[List[int]] = None,
         metrics: MetricSelection = MetricSelection()
-    ) -> List[GridCellData]:
-        """Get enriched forecast data with all metadata."""
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get enriched forecast records (GridCellData fields) with all metadata,
+        plus the number of distinct months they cover.
+        """
+        merged, months_covered = self._enrich(grid_ids, month_ids, metrics)
+        return self._grid_cell_records(merged, metrics), months_covered
+    
+    def _enrich(
+        self,
+        grid_ids: List[int],
+        month_ids: Optional[List[int]] = None,
+        metrics: MetricSelection = MetricSelection()
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Get the forecast rows for the grids/months joined with all metadata
+        (see _merge_enrichment), plus the number of distinct months they cover.
+        
+        Synthetic metric columns are only added when `metrics` selects one of
+        their groups.
+        """
         # Get main forecast data
         main_data = self.data_service.get_grid_data(grid_ids, month_ids)
+        months_covered = int(main_data['month_id'].nunique())
         
         # Get HDI data
         hdi_data = self.data_service.get_hdi_data(grid_ids, month_ids)
@@ -122,225 +269,261 @@ class ForecastService:
         all_coords = self.data_service.get_coordinates(grid_ids)
         
         # Get country names
-        country_data = self.data_service.get_available_countries()
-        country_map = {c['country_id']: c['country'] for c in country_data}
+        country_map = self.data_service.get_country_map()
         
-        # Create a coordinate lookup with fallback generation
-        coord_lookup = {}
-        if not all_coords.empty:
-            for _, coord_row in all_coords.iterrows():
-                coord_lookup[coord_row['priogrid_id']] = coord_row
-        
-        # Generate synthetic coordinates for missing grid cells
-        # Using a deterministic method based on grid ID
-        def generate_coordinates(grid_id: int) -> tuple:
-            """Generate realistic coordinates based on grid ID."""
-            import hashlib
-            # Use grid ID to generate consistent coordinates
-            hash_input = str(grid_id).encode()
-            hash_obj = hashlib.md5(hash_input)
-            hash_int = int(hash_obj.hexdigest()[:8], 16)
-            
-            # Map to realistic global coordinates (avoid polar extremes)
-            lat = ((hash_int % 13000) / 100.0) - 60.0  # Range: -60 to 70
-            lon = (((hash_int // 13000) % 36000) / 100.0) - 180.0  # Range: -180 to 180
-            
-            return lat, lon
+        # Merge all data: one left merge each for HDI and coordinates instead
+        # of boolean masks per row. Left merges keep main_data's row order.
+        merged = self._merge_enrichment(main_data, hdi_data, all_coords)
         
-        # Merge all data
-        enriched_data = []
+        # Generate synthetic coordinates for grid cells without usable ones,
+        # using a deterministic method based on grid ID
+        missing = ~(merged['lat_found'].to_numpy() & merged['lon_found'].to_numpy())
+        if missing.any():
+            lat, lon = self._generate_coordinates_for_grids(merged.loc[missing, 'pg_id'].to_numpy())
+            merged.loc[missing, 'latitude'] = lat
+            merged.loc[missing, 'longitude'] = lon
         
-        for _, row in main_data.iterrows():
-            grid_id = row['pg_id']
-            month_id = row['month_id']
-            
-            # Get HDI data for this grid/month
-            hdi_row = hdi_data[
-                (hdi_data['priogrid_id'] == grid_id) & 
-                (hdi_data['month_id'] == month_id)
-            ]
-            
-            # Get coordinates for this grid ID
-            coord_row = pd.DataFrame()
-            if grid_id in coord_lookup:
-                coord_row = pd.DataFrame([coord_lookup[grid_id]])
-            else:
-                # Generate synthetic coordinates
-                lat, lon = generate_coordinates(grid_id)
-                coord_row = pd.DataFrame([{
-                    'priogrid_id': grid_id,
-                    'latitude': lat,
-                    'longitude': lon,
-                    'country_id': row.get('country_id'),
-                    'row': 0,
-                    'col': 0
-                }])
-            
-            # Create enriched record
-            cell_data = self._create_grid_cell_data(
-                row, hdi_row, coord_row, country_map, metrics
-            )
-            enriched_data.append(cell_data)
+        # Determine country ID - prefer from main data, fallback to coordinates.
+        # Nullable Int64 / None-for-missing columns spare the record builder
+        # per-row NaN checks.
+        merged['country_id'] = merged['country_id'].fillna(merged['coord_country_id']).astype('Int64')
+        country_names = merged['country_id'].map(country_map)
+        merged['country_name'] = country_names.astype(object).where(country_names.notna(), None)
+        
+        # Generate synthetic additional metrics for demo
+        if metrics.include_hdi_50 or metrics.include_hdi_99 or metrics.include_thresholds:
+            synthetic = self._generate_synthetic_metrics_batch(merged['main_dich'].to_numpy(dtype='float64'))
+            for name, values in synthetic.items():
+                merged[name] = values
+        
+        # Convert month ID to year/month, once for the whole column
+        merged['year'], merged['month'] = month_id_to_year_month(merged['month_id'].astype('int64'))
         
         # Debug info
-        coords_with_data = len([d for d in enriched_data if d.latitude is not None])
-        coords_from_file = len([d for d in enriched_data if d.grid_id in coord_lookup])
-        coords_generated = coords_with_data - coords_from_file
+        if logger.isEnabledFor(logging.DEBUG):
+            coords_generated = int(missing.sum())
+            logger.debug(
+                "Enriched %d forecasts: %d coords from file, %d generated",
+                len(merged), len(merged) - coords_generated, coords_generated
+            )
         
-        logger.info(f"Enriched {len(enriched_data)} forecasts: {coords_from_file} coords from file, {coords_generated} generated")
+        return merged, months_covered
+    
+    @staticmethod
+    def _forecast_frame(merged: pd.DataFrame, metrics: MetricSelection) -> pd.DataFrame:
+        """GridCellData columns for an enriched frame; unselected metrics are all NaN."""
+        def metric(column: str, included: bool) -> np.ndarray:
+            if not included:
+                return np.full(len(merged), np.nan)
+            return pd.to_numeric(merged[column], errors='coerce').to_numpy(dtype='float64')
         
-        return enriched_data
+        country_id = merged['country_id']
+        country_name = merged['country_name']
+        return pd.DataFrame({
+            'grid_id': merged['pg_id'].to_numpy(dtype='int64'),
+            'month_id': merged['month_id'].to_numpy(dtype='int64'),
+            'country_id': country_id.astype('int64') if country_id.notna().all() else country_id.astype('float64'),
+            'latitude': merged['latitude'].to_numpy(dtype='float64'),
+            'longitude': merged['longitude'].to_numpy(dtype='float64'),
+            'main_mean': metric('main_mean', metrics.include_map),
+            'main_mean_ln': metric('main_mean_ln', metrics.include_map),
+            'main_dich': metric('main_dich', metrics.include_thresholds),
+            'hdi_50_lower': metric('hdi_50_lower', metrics.include_hdi_50),
+            'hdi_50_upper': metric('hdi_50_upper', metrics.include_hdi_50),
+            'hdi_90_lower': metric('hdi_90_lower', metrics.include_hdi_90),
+            'hdi_90_upper': metric('hdi_90_upper', metrics.include_hdi_90),
+            'hdi_99_lower': metric('hdi_99_lower', metrics.include_hdi_99),
+            'hdi_99_upper': metric('hdi_99_upper', metrics.include_hdi_99),
+            'threshold_1': metric('main_dich', metrics.include_thresholds),
+            **{
+                f'threshold_{level}': metric(f'threshold_{level}', metrics.include_thresholds)
+                for level in range(2, 7)
+            },
+            'conflict_type': ConflictType.STATE_BASED.value,
+            'country_name': country_name.tolist(),
+            'year': merged['year'].to_numpy(dtype='int64'),
+            'month': merged['month'].to_numpy(dtype='int64'),
+        })
     
-    def _create_grid_cell_data(
+    def _merge_enrichment(
         self,
-        main_row: pd.Series,
+        main_data: pd.DataFrame,
         hdi_data: pd.DataFrame,
-        coord_data: pd.DataFrame,
-        country_map: Dict[int, str],
-        metrics: MetricSelection
-    ) -> GridCellData:
-        """Create a GridCellData object from raw data."""
-        grid_id = main_row['pg_id']
-        
-        # Extract coordinates by matching grid IDs
-        lat, lon = None, None
-        country_id_from_coord = None
-        
-        if not coord_data.empty:
-            # Look for matching data by priogrid_id
-            matching_coords = coord_data[coord_data['priogrid_id'] == grid_id]
-            
-            if not matching_coords.empty:
-                coord_row = matching_coords.iloc[0]
-                lat = coord_row.get('lat') or coord_row.get('latitude')
-                lon = coord_row.get('lon') or coord_row.get('longitude') 
-                country_id_from_coord = coord_row.get('country_id')
-        
-        # If no coordinates found, generate them (fallback)
-        if lat is None or lon is None:
-            lat, lon = self._generate_coordinates_for_grid(grid_id)
-        
-        # Extract HDI data by matching grid IDs
-        hdi_values = {}
-        if not hdi_data.empty:
-            matching_hdi = hdi_data[hdi_data['priogrid_id'] == grid_id]
-            
-            if not matching_hdi.empty:
-                hdi_row = matching_hdi.iloc[0]
-                # Debug: Check what columns are available
-                logger.debug(f"HDI columns available: {list(hdi_row.index)}")
-                logger.debug(f"HDI values for grid {grid_id}: {dict(hdi_row)}")
-                
-                hdi_values = {
-                    'hdi_90_lower': hdi_row.get('pred_ln_sb_prob_hdi_lower'),
-                    'hdi_90_upper': hdi_row.get('pred_ln_sb_prob_hdi_upper'),
-                }
-                logger.debug(f"Extracted HDI values: {hdi_values}")
+        all_coords: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Join forecast rows with their HDI interval and coordinates.
+        
+        Returns one row per main_data row, in the same order, with the main
+        forecast columns plus hdi_90_lower/upper, latitude/longitude,
+        lat_found/lon_found and coord_country_id. HDI matches on grid and
+        month and uses the first matching row; coordinates match on grid and
+        use the last row for that grid in the coordinate data.
+        """
+        merged = pd.DataFrame({'pg_id': main_data['pg_id'], 'month_id': main_data['month_id']})
+        merged['country_id'] = main_data['country_id'] if 'country_id' in main_data.columns else np.nan
+        for column in ('main_mean', 'main_mean_ln'):
+            merged[column] = main_data[column] if column in main_data.columns else None
+        merged['main_dich'] = main_data['main_dich'] if 'main_dich' in main_data.columns else 0.01
+        merged = merged.reset_index(drop=True)
+        
+        # HDI interval, matched on grid and month
+        hdi_columns = [c for c in HDI_90_COLUMNS if c in hdi_data.columns]
+        if hdi_columns:
+            hdi = (
+                hdi_data[['priogrid_id', 'month_id', *hdi_columns]]
+                .drop_duplicates(['priogrid_id', 'month_id'], keep='first')
+                .rename(columns={'priogrid_id': 'pg_id', **HDI_90_COLUMNS})
+            )
+            merged = merged.merge(hdi, on=['pg_id', 'month_id'], how='left')
+        for column in HDI_90_COLUMNS.values():
+            if column not in merged.columns:
+                merged[column] = None
             else:
-                logger.debug(f"No HDI match found for grid {grid_id}")
+                merged[column] = merged[column].astype(object).where(merged[column].notna(), None)
+        
+        # Coordinates, matched on grid
+        coords = pd.DataFrame(index=pd.RangeIndex(0))
+        if not all_coords.empty:
+            last = all_coords.drop_duplicates('priogrid_id', keep='last')
+            latitude = self._coordinate_values(last, 'latitude')
+            longitude = self._coordinate_values(last, 'longitude')
+            coords = pd.DataFrame({
+                'pg_id': last['priogrid_id'].to_numpy(),
+                'latitude': latitude,
+                'longitude': longitude,
+                'lat_found': ~np.isnan(latitude),
+                'lon_found': ~np.isnan(longitude),
+                'coord_country_id': (
+                    last['country_id'].to_numpy() if 'country_id' in last.columns else np.nan
+                ),
+            })
+        if coords.empty:
+            merged['latitude'] = np.nan
+            merged['longitude'] = np.nan
+            merged['lat_found'] = False
+            merged['lon_found'] = False
+            merged['coord_country_id'] = np.nan
         else:
-            logger.debug("HDI data is empty")
-        # Generate synthetic additional metrics for demo
-        base_prob = main_row.get('main_dich', 0.01)
-        synthetic_metrics = self._generate_synthetic_metrics(base_prob)
-        
-        # Determine country ID - prefer from main data, fallback to coordinates
-        country_id = main_row.get('country_id')
-        if pd.isna(country_id) and country_id_from_coord is not None:
-            country_id = country_id_from_coord
-        
-        # Get country name
-        country_name = None
-        if pd.notna(country_id):
-            country_name = country_map.get(int(country_id))
-        
-        # Convert month ID to year/month
-        month_id = main_row['month_id']
-        year = 2025 + (month_id - 548) // 12
-        month = ((month_id - 548) % 12) + 1
-        
-        return GridCellData(
-            grid_id=int(grid_id),
-            month_id=int(month_id),
-            country_id=int(country_id) if pd.notna(country_id) else None,
-            latitude=lat,
-            longitude=lon,
+            merged = merged.merge(coords, on='pg_id', how='left')
+            merged['lat_found'] = merged['lat_found'].fillna(False).astype(bool)
+            merged['lon_found'] = merged['lon_found'].fillna(False).astype(bool)
+        
+        return merged
+    
+    @staticmethod
+    def _coordinate_values(coords: pd.DataFrame, column: str) -> np.ndarray:
+        """A coordinate column as float64, all NaN when the coordinate data lacks it."""
+        if column not in coords.columns:
+            return np.full(len(coords), np.nan)
+        return coords[column].to_numpy(dtype='float64')
+    
+    @staticmethod
+    def _grid_cell_records(merged: pd.DataFrame, metrics: MetricSelection) -> List[Dict[str, Any]]:
+        """
+        Create GridCellData records (field name -> value) from an enriched frame.
+        
+        Records are zipped together column by column: unselected metric groups
+        are a repeated None, so no per-row checks are needed. The values come
+        straight from the loaded frames, so the get_forecasts_* wrappers build
+        models from these records with model_construct rather than validating
+        every field again.
+        """
+        n_rows = len(merged)
+        
+        def metric(column: str, included: bool):
+            return merged[column] if included else itertools.repeat(None, n_rows)
+        
+        country_id = merged['country_id']
+        columns = {
+            'grid_id': merged['pg_id'].tolist(),
+            'month_id': merged['month_id'].tolist(),
+            'country_id': country_id.astype(object).where(country_id.notna(), None).tolist(),
+            'latitude': merged['latitude'],
+            'longitude': merged['longitude'],
             
             # Main predictions
-            main_mean=main_row.get('main_mean') if metrics.include_map else None,
-            main_mean_ln=main_row.get('main_mean_ln') if metrics.include_map else None,
-            main_dich=main_row.get('main_dich') if metrics.include_thresholds else None,
+            'main_mean': metric('main_mean', metrics.include_map),
+            'main_mean_ln': metric('main_mean_ln', metrics.include_map),
+            'main_dich': metric('main_dich', metrics.include_thresholds),
             
             # HDI bounds (real data if available, synthetic for missing levels)
-            hdi_50_lower=synthetic_metrics['hdi_50_lower'] if metrics.include_hdi_50 else None,
-            hdi_50_upper=synthetic_metrics['hdi_50_upper'] if metrics.include_hdi_50 else None,
-            hdi_90_lower=hdi_values.get('hdi_90_lower') if metrics.include_hdi_90 else None,
-            hdi_90_upper=hdi_values.get('hdi_90_upper') if metrics.include_hdi_90 else None,
-            hdi_99_lower=synthetic_metrics['hdi_99_lower'] if metrics.include_hdi_99 else None,
-            hdi_99_upper=synthetic_metrics['hdi_99_upper'] if metrics.include_hdi_99 else None,
+            'hdi_50_lower': metric('hdi_50_lower', metrics.include_hdi_50),
+            'hdi_50_upper': metric('hdi_50_upper', metrics.include_hdi_50),
+            'hdi_90_lower': metric('hdi_90_lower', metrics.include_hdi_90),
+            'hdi_90_upper': metric('hdi_90_upper', metrics.include_hdi_90),
+            'hdi_99_lower': metric('hdi_99_lower', metrics.include_hdi_99),
+            'hdi_99_upper': metric('hdi_99_upper', metrics.include_hdi_99),
             
             # Threshold probabilities (1 real, others synthetic)
-            threshold_1=base_prob if metrics.include_thresholds else None,
-            threshold_2=synthetic_metrics['threshold_2'] if metrics.include_thresholds else None,
-            threshold_3=synthetic_metrics['threshold_3'] if metrics.include_thresholds else None,
-            threshold_4=synthetic_metrics['threshold_4'] if metrics.include_thresholds else None,
-            threshold_5=synthetic_metrics['threshold_5'] if metrics.include_thresholds else None,
-            threshold_6=synthetic_metrics['threshold_6'] if metrics.include_thresholds else None,
+            'threshold_1': metric('main_dich', metrics.include_thresholds),
+            **{
+                f'threshold_{level}': metric(f'threshold_{level}', metrics.include_thresholds)
+                for level in range(2, 7)
+            },
             
             # Metadata
-            conflict_type=ConflictType.STATE_BASED,  # Default to state-based
-            country_name=country_name,
-            year=year,
-            month=month
-        )
+            'conflict_type': itertools.repeat(ConflictType.STATE_BASED.value, n_rows),  # Default to state-based
+            'country_name': merged['country_name'],
+            'year': merged['year'].tolist(),
+            'month': merged['month'].tolist(),
+        }
+        fields = tuple(columns)
+        return [dict(zip(fields, values)) for values in zip(*columns.values())]
     
     def _generate_coordinates_for_grid(self, grid_id: int) -> tuple:
         """Generate realistic coordinates based on grid ID."""
-        import hashlib
-        # Use grid ID to generate consistent coordinates
-        hash_input = str(grid_id).encode()
-        hash_obj = hashlib.md5(hash_input)
-        hash_int = int(hash_obj.hexdigest()[:8], 16)
+        lat, lon = self._generate_coordinates_for_grids(np.array([grid_id]))
+        return float(lat[0]), float(lon[0])
+    
+    @staticmethod
+    def _generate_coordinates_for_grids(grid_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate realistic coordinates for an array of grid IDs in one pass."""
+        # Use grid ID to generate consistent coordinates (low 32 hash bits)
+        h = _splitmix64(grid_ids) & np.uint64(0xFFFFFFFF)
         
         # Map to realistic global coordinates (avoid polar extremes)
-        lat = ((hash_int % 13000) / 100.0) - 60.0  # Range: -60 to 70
-        lon = (((hash_int // 13000) % 36000) / 100.0) - 180.0  # Range: -180 to 180
+        lat = ((h % np.uint64(13000)) / 100.0) - 60.0  # Range: -60 to 70
+        lon = (((h // np.uint64(13000)) % np.uint64(36000)) / 100.0) - 180.0  # Range: -180 to 180
         
         return lat, lon
     
     def _generate_synthetic_metrics(self, base_prob: float) -> Dict[str, float]:
         """Generate synthetic metrics for demonstration purposes."""
-        # Use deterministic generation based on base probability
-        np.random.seed(int(base_prob * 10000) % 2**32)
+        metrics = self._generate_synthetic_metrics_batch(np.array([base_prob]))
+        return {name: float(values[0]) for name, values in metrics.items()}
+    
+    @staticmethod
+    def _generate_synthetic_metrics_batch(base_probs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Generate synthetic metrics for an array of base probabilities in one pass."""
+        base = np.asarray(base_probs, dtype='float64')
         
-        return {
-            # Synthetic HDI bounds (narrower and wider than 90%)
-            'hdi_50_lower': max(0, base_prob - np.random.uniform(0.001, 0.005)),
-            'hdi_50_upper': min(1, base_prob + np.random.uniform(0.001, 0.005)),
-            'hdi_99_lower': max(0, base_prob - np.random.uniform(0.01, 0.03)),
-            'hdi_99_upper': min(1, base_prob + np.random.uniform(0.01, 0.03)),
-            
-            # Synthetic threshold probabilities (different conflict severity levels)
-            'threshold_2': max(0, base_prob - np.random.uniform(0.001, 0.01)),  # 5+ fatalities
-            'threshold_3': max(0, base_prob - np.random.uniform(0.01, 0.02)),   # 10+ fatalities
-            'threshold_4': max(0, base_prob - np.random.uniform(0.02, 0.04)),   # 25+ fatalities
-            'threshold_5': max(0, base_prob - np.random.uniform(0.03, 0.06)),   # 100+ fatalities
-            'threshold_6': max(0, base_prob - np.random.uniform(0.05, 0.08)),   # 1000+ fatalities
-        }
+        # Use deterministic generation based on base probability: hash
+        # (probability bucket, metric) pairs to uniforms in [0, 1)
+        buckets = np.where(np.isfinite(base), base * 10000, 0).astype(np.int64) % 2**32
+        keys = buckets[:, None] * len(SYNTHETIC_METRIC_OFFSETS) + np.arange(len(SYNTHETIC_METRIC_OFFSETS))
+        values = (_splitmix64(keys) >> np.uint64(11)) * 2.0**-53
+        
+        # Synthetic HDI bounds (narrower and wider than 90%) and threshold
+        # probabilities (conflict severity levels), all metrics in one
+        # (cells, metrics) matrix updated in place:
+        # base + sign * (low + u * (high - low)), clipped to [0, 1]
+        values *= _SYNTHETIC_SIGN * (_SYNTHETIC_HIGH - _SYNTHETIC_LOW)
+        values += _SYNTHETIC_SIGN * _SYNTHETIC_LOW
+        values += base[:, None]
+        np.clip(values, 0.0, 1.0, out=values)
+        
+        # Column-major copy so each metric is one contiguous array
+        values = np.asfortranarray(values)
+        return {name: values[:, column] for column, name in enumerate(SYNTHETIC_METRIC_OFFSETS)}
     
     def get_countries(self) -> List[Dict[str, Any]]:
         """Get list of available countries with metadata."""
         countries = self.data_service.get_available_countries()
         
         # Add grid cell counts
+        counts = self.data_service.get_country_grid_counts()
         for country in countries:
-            try:
-                grid_ids = self.data_service.get_country_grids(country['country_id'])
-                country['grid_cells_count'] = len(grid_ids)
-            except DataNotFoundError:
-                country['grid_cells_count'] = 0
-            except Exception as e:
-                logger.warning(f"Error getting grid count for country {country['country_id']}: {e}")
-                country['grid_cells_count'] = 0
+            country['grid_cells_count'] = counts.get(country['country_id'], 0)
         
         return countries
\ No newline at end of file
@@ -2,6 +2,8 @@
 Test suite for VIEWS Conflict Forecasting API
 """
 
+import io
+import os
 import pytest
 import pandas as pd
 from fastapi.testclient import TestClient
@@ -28,10 +30,12 @@ def mock_data_service():
     
     # Mock data
     service.get_available_months.return_value = [548, 549, 550]
+    service.get_months_in_range.return_value = [548, 549]
     service.get_available_countries.return_value = [
         {'country_id': 1, 'country': 'Testland', 'isoab': 'TST'}
     ]
     service.get_total_grid_cells.return_value = 100
+    service.get_country_map.return_value = {1: 'Testland'}
     
     # Sample grid data
     sample_data = pd.DataFrame({
@@ -46,6 +50,7 @@ def mock_data_service():
     service.get_month_data.return_value = sample_data
     
     service.get_country_grids.return_value = [62356, 62357, 62358]
+    service.get_country_grid_counts.return_value = {1: 3}
     
     # HDI data
     hdi_data = pd.DataFrame({
@@ -98,7 +103,7 @@ class TestAPI:
     @patch('main.forecast_service')
     def test_get_forecasts_by_country(self, mock_service, client):
         """Test country forecast endpoint."""
-        mock_service.get_forecasts_by_country.return_value = []
+        mock_service.get_forecast_records_by_country.return_value = ([], 0)
         
         response = client.get("/api/forecasts/country/1")
         assert response.status_code == 200
@@ -110,7 +115,7 @@ class TestAPI:
     @patch('main.forecast_service')
     def test_get_forecasts_by_grid(self, mock_service, client):
         """Test grid forecast endpoint."""
-        mock_service.get_forecasts_by_grid.return_value = []
+        mock_service.get_forecast_records_by_grid.return_value = ([], 0)
         
         response = client.get("/api/forecasts/grid?grid_ids=62356&grid_ids=62357")
         assert response.status_code == 200
@@ -120,6 +125,42 @@ class TestAPI:
         response = client.get("/api/forecasts/grid")
         assert response.status_code == 422  # Validation error
     
+    def test_get_forecasts_by_grid_too_many_ids(self, client):
+        """Test grid endpoint rejects oversized grid ID lists."""
+        response = client.get("/api/forecasts/grid", params=[("grid_ids", 1)] * 5001)
+        assert response.status_code == 422
+    
+    @patch('main.forecast_service')
+    def test_get_forecasts_by_month_cached(self, mock_service, client):
+        """Test repeat month queries are served from the response cache."""
+        from main import _cached_month_bytes
+        _cached_month_bytes.cache_clear()
+        mock_service.get_forecast_records_by_month.return_value = []
+        
+        for _ in range(2):
+            response = client.get("/api/forecasts/month/548?country_id=1")
+            assert response.status_code == 200
+            assert response.json()["total_cells"] == 0
+        
+        assert mock_service.get_forecast_records_by_month.call_count == 1
+        _cached_month_bytes.cache_clear()
+    
+    @patch('main.forecast_service')
+    def test_get_forecasts_by_month_parquet(self, mock_service, client):
+        """Test month endpoint Parquet download."""
+        mock_service.get_forecasts_by_month_df.return_value = pd.DataFrame({
+            'grid_id': [62356, 62357],
+            'month_id': [548, 548],
+            'main_mean': [0.1, 0.2]
+        })
+        
+        response = client.get("/api/forecasts/month/548.parquet")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        
+        df = pd.read_parquet(io.BytesIO(response.content))
+        assert df['grid_id'].tolist() == [62356, 62357]
+    
     @patch('main.forecast_service')
     def test_get_countries(self, mock_service, client):
         """Test countries endpoint."""
@@ -152,6 +193,77 @@ class TestDataService:
         assert service.pgm_data is not None
         assert len(service.pgm_data) > 0
     
+    def test_hdi_data_loaded_on_first_access(self):
+        """Test HDI data is deferred until it is first used."""
+        service = DataService()
+        service.load_data()
+        
+        with patch.object(DataService, '_load_hdi_data') as load_hdi:
+            assert service.loaded_hdi_data is None
+            load_hdi.assert_not_called()
+            assert service.hdi_data is None
+            assert service.hdi_data is None
+        load_hdi.assert_called_once()
+    
+    def test_read_table_uses_parquet_copy(self, tmp_path):
+        """Test CSV files are converted to Parquet and read back pruned."""
+        csv_path = tmp_path / "sample.csv.gz"
+        pd.DataFrame({'pg_id': [1, 2], 'month_id': [548, 548], 'extra': ['a', 'b']}).to_csv(
+            csv_path, index=False
+        )
+        service = DataService()
+        
+        first = service._read_table(str(csv_path), ['pg_id', 'month_id', 'missing'])
+        assert (tmp_path / "sample.parquet").exists()
+        
+        second = service._read_table(str(csv_path), ['pg_id', 'month_id', 'missing'])
+        assert list(second.columns) == ['pg_id', 'month_id']
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_read_table_refreshes_copy_of_replaced_csv(self, tmp_path):
+        """Test a CSV replaced by a file with an older mtime is parsed again."""
+        csv_path = tmp_path / "sample.csv"
+        pd.DataFrame({'pg_id': [1, 2]}).to_csv(csv_path, index=False)
+        service = DataService()
+        service._read_table(str(csv_path))
+        
+        # Restored with its original timestamp, e.g. by cp -p or rsync
+        pd.DataFrame({'pg_id': [3, 4, 5]}).to_csv(csv_path, index=False)
+        old_mtime = (tmp_path / "sample.parquet").stat().st_mtime - 60
+        os.utime(csv_path, (old_mtime, old_mtime))
+        
+        assert service._read_table(str(csv_path))['pg_id'].tolist() == [3, 4, 5]
+        assert service._read_table(str(csv_path))['pg_id'].tolist() == [3, 4, 5]
+    
+    def test_read_table_parquet_only(self, tmp_path):
+        """Test a data source deployed only as Parquet is read without its CSV."""
+        csv_path = tmp_path / "sample.csv"
+        pd.DataFrame({'pg_id': [1, 2], 'month_id': [548, 549]}).to_parquet(tmp_path / "sample.parquet")
+        
+        assert DataService._source_exists(str(csv_path))
+        df = DataService()._read_table(str(csv_path), ['pg_id'])
+        assert df['pg_id'].tolist() == [1, 2]
+    
+    def test_load_data_uses_disk_cache(self, tmp_path, monkeypatch):
+        """Test a second load is restored from the on-disk memo."""
+        monkeypatch.setattr('services.data_service.LOAD_CACHE_DIR', tmp_path)
+        first = DataService()
+        first.load_data()
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+        
+        second = DataService()
+        with patch.object(DataService, '_load_pgm_data') as load_pgm:
+            second.load_data()
+        load_pgm.assert_not_called()
+        
+        assert second.is_loaded is True
+        pd.testing.assert_frame_equal(first.pgm_data, second.pgm_data)
+        assert second.country_grid_mapping.keys() == first.country_grid_mapping.keys()
+        assert all(
+            np.array_equal(grids, first.country_grid_mapping[country_id])
+            for country_id, grids in second.country_grid_mapping.items()
+        )
+    
     def test_get_available_months(self):
         """Test getting available months."""
         service = DataService()
@@ -162,15 +274,113 @@ class TestDataService:
         assert len(months) > 0
         assert all(isinstance(m, int) for m in months)
     
+    def test_available_lists_cached(self):
+        """Test month and country lists are computed once and safe to modify."""
+        service = DataService()
+        service.load_data()
+        
+        with patch.object(service, '_query_available_months', wraps=service._query_available_months) as query:
+            service._reset_query_caches()
+            months = service.get_available_months()
+            months.append(-1)
+            assert service.get_available_months() == months[:-1]
+            assert query.call_count == 1
+        
+        countries = service.get_available_countries()
+        countries[0]['country'] = 'Changed'
+        assert service.get_available_countries()[0]['country'] != 'Changed'
+        
+        country_map = service.get_country_map()
+        assert country_map[countries[0]['country_id']] != 'Changed'
+        assert len(country_map) == len(countries)
+    
+    def test_get_months_in_range(self):
+        """Test month ranges are inclusive, open-ended without a bound and clipped to the data."""
+        service = DataService()
+        service.load_data()
+        months = service.get_available_months()
+        
+        start, end = months[1], months[-2]
+        assert service.get_months_in_range(start, end) == [m for m in months if start <= m <= end]
+        assert service.get_months_in_range(month_start=start) == months[1:]
+        assert service.get_months_in_range(month_end=end) == months[:-1]
+        assert service.get_months_in_range(months[-1] + 1, months[-1] + 5) == []
+    
     def test_get_country_grids(self):
         """Test getting grid IDs for a country."""
         service = DataService()
         service.load_data()
         
         grid_ids = service.get_country_grids(1)
-        assert isinstance(grid_ids, list)
+        assert isinstance(grid_ids, np.ndarray)
         assert len(grid_ids) > 0
     
+    def test_get_country_grid_counts(self):
+        """Test grid counts match the per-country grid lists."""
+        service = DataService()
+        service.load_data()
+        
+        counts = service.get_country_grid_counts()
+        assert counts
+        assert all(counts[c] == len(service.get_country_grids(c)) for c in counts)
+    
+    def test_normalize_coordinate_columns(self):
+        """Test lat/lon columns are folded into latitude/longitude."""
+        df = pd.DataFrame({'lat': [0.0, 1.5], 'latitude': [2.0, 3.0], 'lon': [4.0, 5.0]})
+        DataService._normalize_coordinate_columns(df)
+        
+        assert list(df.columns) == ['latitude', 'longitude']
+        assert df['latitude'].tolist() == [2.0, 1.5]
+        assert df['longitude'].tolist() == [4.0, 5.0]
+    
+    def test_group_grid_ids(self):
+        """Test grid IDs are grouped per country in row order, skipping missing countries."""
+        mapping = DataService._group_grid_ids(
+            pd.Series([2.0, np.nan, 1.0, 2.0]), pd.Series([10, 11, 12, 13])
+        )
+        assert {k: v.tolist() for k, v in mapping.items()} == {1: [12], 2: [10, 13]}
+    
+    def test_unique_pairs(self):
+        """Test distinct country/grid pairs keep first-appearance order."""
+        cids, pgids = DataService._unique_pairs(
+            pd.Series(np.array([2, 2, 1, 2], dtype=np.int16)),
+            pd.Series(np.array([10, 10, -12, 13], dtype=np.int32))
+        )
+        assert cids.tolist() == [2, 1, 2]
+        assert pgids.tolist() == [10, -12, 13]
+    
+    def test_rows_for_keeps_file_order(self):
+        """Test indexed row lookups return matching positions in file order."""
+        service = DataService()
+        df = pd.DataFrame({'pg_id': [5, 3, 5, 7, 3], 'month_id': [1, 1, 2, 1, 2]})
+        
+        positions = service._rows_for('test', df, 'pg_id', [5, 3, 5])
+        assert positions.tolist() == [0, 1, 2, 4]
+        assert service._rows_for('test', df, 'pg_id', [9]).tolist() == []
+    
+    def test_rows_for_narrow_key_dtype(self):
+        """Test lookups against an int32 index accept wider and out-of-range IDs."""
+        service = DataService()
+        df = pd.DataFrame({'pg_id': np.array([5, 3, 5], dtype=np.int32)})
+        
+        assert service._rows_for('test', df, 'pg_id', np.array([3], dtype=np.int64)).tolist() == [1]
+        assert service._rows_for('test', df, 'pg_id', [5, 2**40]).tolist() == [0, 2]
+    
+    def test_get_month_data_filters_country_column(self):
+        """Test month lookups narrow by an inline country_id column."""
+        service = DataService()
+        service.pgm_data = pd.DataFrame({
+            'pg_id': [1, 2, 3, 4],
+            'month_id': [548, 549, 548, 548],
+            'country_id': [10, 10, 20, 10]
+        })
+        service.is_loaded = True
+        
+        assert service.get_month_data(548)['pg_id'].tolist() == [1, 3, 4]
+        assert service.get_month_data(548, 10)['pg_id'].tolist() == [1, 4]
+        with pytest.raises(DataNotFoundError):
+            service.get_month_data(550)
+    
     def test_get_country_grids_not_found(self):
         """Test getting grids for non-existent country."""
         service = DataService()
@@ -198,6 +408,17 @@ class TestDataService:
         
         with pytest.raises(DataNotFoundError):
             service.get_grid_data([999999])
+    
+    def test_get_grid_data_cached(self):
+        """Test repeat grid queries are answered from the query cache."""
+        service = DataService()
+        service.load_data()
+        
+        first = service.get_grid_data([62356, 79599], [548, 549])
+        second = service.get_grid_data([79599, 62356, 62356], [549, 548])
+        
+        assert second is first
+        assert service._grid_data_cache.cache_info().hits == 1
 
 
 class TestForecastService:
@@ -212,15 +433,22 @@ class TestForecastService:
         assert "api_version" in info
         assert info["total_grid_cells"] == 100
     
+    def test_get_countries(self, forecast_service):
+        """Test countries carry their grid cell counts."""
+        countries = forecast_service.get_countries()
+        
+        assert countries[0]['grid_cells_count'] == 3
+    
     def test_get_forecasts_by_country(self, forecast_service):
         """Test getting forecasts by country."""
-        forecasts = forecast_service.get_forecasts_by_country(
+        forecasts, months_covered = forecast_service.get_forecasts_by_country(
             country_id=1,
             metrics=MetricSelection()
         )
         
         assert isinstance(forecasts, list)
         assert len(forecasts) > 0
+        assert months_covered == 1
         
         # Check first forecast
         forecast = forecasts[0]
@@ -230,7 +458,7 @@ class TestForecastService:
     
     def test_get_forecasts_by_grid(self, forecast_service):
         """Test getting forecasts by grid IDs."""
-        forecasts = forecast_service.get_forecasts_by_grid(
+        forecasts, _ = forecast_service.get_forecasts_by_grid(
             grid_ids=[62356, 62357],
             metrics=MetricSelection()
         )
@@ -238,6 +466,27 @@ class TestForecastService:
         assert isinstance(forecasts, list)
         assert len(forecasts) > 0
     
+    def test_get_forecasts_by_grid_result_cap(self, forecast_service):
+        """Test that grid queries exceeding the result cell cap are rejected."""
+        with pytest.raises(ValidationError):
+            forecast_service.get_forecasts_by_grid(
+                grid_ids=list(range(20000)),
+                metrics=MetricSelection()
+            )
+    
+    def test_forecasts_empty_month_range(self, forecast_service, mock_data_service):
+        """Test a month range outside the data returns nothing rather than every month."""
+        mock_data_service.get_months_in_range.return_value = []
+        
+        records, months_covered = forecast_service.get_forecast_records_by_grid(
+            list(range(4000)), month_start=9999
+        )
+        assert records == [] and months_covered == 0
+        
+        records, months_covered = forecast_service.get_forecast_records_by_country(1, month_start=9999)
+        assert records == [] and months_covered == 0
+        mock_data_service.get_grid_data.assert_not_called()
+    
     def test_metric_selection(self, forecast_service):
         """Test metric selection functionality."""
         metrics = MetricSelection(
@@ -246,7 +495,7 @@ class TestForecastService:
             include_thresholds=True
         )
         
-        forecasts = forecast_service.get_forecasts_by_country(
+        forecasts, _ = forecast_service.get_forecasts_by_country(
             country_id=1,
             metrics=metrics
         )
@@ -256,9 +505,71 @@ class TestForecastService:
         assert forecast.hdi_90_lower is None   # HDI not included
         assert forecast.threshold_1 is not None  # Thresholds included
     
+    def test_enrichment_joins_hdi_and_coordinates(self, forecast_service, mock_data_service):
+        """Test records pick up HDI bounds and coordinates by grid, generating missing coordinates."""
+        mock_data_service.get_coordinates.return_value = pd.DataFrame({
+            'priogrid_id': [62358, 62356],
+            'latitude': [47.0, 45.0],
+            'longitude': [14.0, 12.0]
+        })
+        
+        records, _ = forecast_service.get_forecast_records_by_grid(
+            grid_ids=[62356, 62357, 62358],
+            metrics=MetricSelection()
+        )
+        
+        assert [r['grid_id'] for r in records] == [62356, 62357, 62358]
+        assert [r['hdi_90_upper'] for r in records] == [0.015, 0.025, 0.035]
+        assert (records[0]['latitude'], records[0]['longitude']) == (45.0, 12.0)
+        assert (records[1]['latitude'], records[1]['longitude']) == \
+            forecast_service._generate_coordinates_for_grid(62357)
+        assert records[0]['country_name'] == 'Testland'
+        assert (records[0]['year'], records[0]['month']) == (2025, 1)
+    
+    def test_get_forecasts_by_month_df_matches_records(self, forecast_service):
+        """Test the month DataFrame holds the same values as the month records."""
+        metrics = MetricSelection(include_hdi_50=True)
+        df = forecast_service.get_forecasts_by_month_df(548, metrics=metrics)
+        records = forecast_service.get_forecast_records_by_month(548, metrics=metrics)
+        
+        assert list(df.columns) == list(records[0])
+        assert df['grid_id'].tolist() == [r['grid_id'] for r in records]
+        assert df['hdi_50_lower'].tolist() == [r['hdi_50_lower'] for r in records]
+        assert df['hdi_99_lower'].isna().all()
+    
+    def test_iter_forecast_records_by_month_enriches_once(self, forecast_service):
+        """Test streamed month batches come from a single enrichment and match the full records."""
+        with patch.object(forecast_service, '_enrich', wraps=forecast_service._enrich) as enrich:
+            batches = list(forecast_service.iter_forecast_records_by_month(548, batch_size=1))
+        
+        enrich.assert_called_once()
+        assert all(len(batch) == 1 for batch in batches)
+        assert [r for batch in batches for r in batch] == forecast_service.get_forecast_records_by_month(548)
+    
+    def test_synthetic_metrics_skipped_when_unselected(self, forecast_service):
+        """Test no synthetic metrics are generated when no group needs them."""
+        metrics = MetricSelection(include_thresholds=False)
+        with patch.object(ForecastService, '_generate_synthetic_metrics_batch') as generate:
+            records, _ = forecast_service.get_forecast_records_by_grid([62356], metrics=metrics)
+            forecast_service.get_forecasts_by_month_df(548, metrics=metrics)
+        
+        generate.assert_not_called()
+        assert records[0]['threshold_2'] is None and records[0]['hdi_50_lower'] is None
+    
+    def test_synthetic_metrics_batch(self, forecast_service):
+        """Test batched synthetic metrics are deterministic per base probability and bounded."""
+        base = np.array([0.02, 0.5, 0.02, 0.0, 1.0])
+        metrics = forecast_service._generate_synthetic_metrics_batch(base)
+        
+        assert metrics['hdi_50_lower'][0] == metrics['hdi_50_lower'][2]
+        assert metrics['hdi_99_upper'][1] == forecast_service._generate_synthetic_metrics(0.5)['hdi_99_upper']
+        for values in metrics.values():
+            assert ((values >= 0) & (values <= 1)).all()
+        assert (metrics['hdi_50_lower'] <= base).all() and (metrics['hdi_50_upper'] >= base).all()
+    
     def test_synthetic_metrics_generation(self, forecast_service):
         """Test that synthetic metrics are generated properly."""
-        forecasts = forecast_service.get_forecasts_by_country(
+        forecasts, _ = forecast_service.get_forecasts_by_country(
             country_id=1,
             metrics=MetricSelection(include_hdi_50=True, include_hdi_99=True)
         )